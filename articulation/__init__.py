@@ -0,0 +1,7 @@
+"""
+Shared helpers for working with the articulation datasets
+(results/, filtered_results/, district_csvs/) outside of the ragged CSVs.
+
+Scripts elsewhere in the repo import this package after putting the repo
+root on sys.path.
+"""
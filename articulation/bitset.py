@@ -0,0 +1,154 @@
+"""
+Bitset form of the per-UC course selections, for overlap analysis over
+many UCs at once.
+
+Course codes of one CC/district are interned to bit positions, so a set of
+courses is a Python int: union is |, "not already taken" is & ~, and the
+size is a popcount. For n UCs the union of every subset of them is
+precomputed (2^n masks; 512 for the nine UC campuses), which makes any
+"courses still needed for UC u after the UCs in S" lookup one AND + one
+popcount.
+
+role_totals(k) sums those lookups over every ordered choice of k UCs
+without enumerating the n!/(n-k)! orders: the count for u in position r
+only depends on the *set* S of UCs before it, and each S of size r is
+followed by u in r! * P(n-1-r, k-1-r) of the orders.
+
+optimal_order(k) picks the k UCs that need the fewest courses in total
+(unique CC courses + unarticulated courses), then the order to add them in
+that keeps the running total lowest: the sum of that total over every
+prefix. The total after all k UCs does not depend on the order, but how
+fast it grows does; this is a DP over the 2^n subsets instead of a search
+over n!/(n-k)! orders.
+"""
+
+from math import perm
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+class CourseIndex:
+    """Interns course codes to bit positions."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def mask(self, courses):
+        mask = 0
+        for course in courses:
+            bit = self.ids.setdefault(course, len(self.ids))
+            mask |= 1 << bit
+        return mask
+
+    def courses(self, mask):
+        return {course for course, bit in self.ids.items() if mask >> bit & 1}
+
+
+def subset_unions(masks):
+    """unions[s] = OR of masks[i] for every bit i set in s."""
+    unions = [0] * (1 << len(masks))
+    for s in range(1, len(unions)):
+        low = s & -s
+        unions[s] = unions[s ^ low] | masks[low.bit_length() - 1]
+    return unions
+
+
+def _course_selection(uc):
+    return uc.course_selection
+
+
+class UCBitsets:
+    """
+    Course selections of `uc_list` in one compiled model, as bitmasks.
+    `select` maps a UCModel to its (CC courses, unarticulated courses);
+    by default UCModel.course_selection.
+    """
+
+    def __init__(self, model, uc_list, select=_course_selection):
+        self.ucs = list(uc_list)
+        self.index = CourseIndex()
+        self.courses = []
+        self.unarticulated = []
+        for uc in self.ucs:
+            courses, unarticulated = select(model.uc(uc))
+            self.courses.append(self.index.mask(courses))
+            self.unarticulated.append(len(unarticulated))
+        self.unions = subset_unions(self.courses)
+
+    def new_courses(self, i, before):
+        """Courses UC i adds on top of the UCs in the subset mask `before`."""
+        return popcount(self.courses[i] & ~self.unions[before])
+
+    def cost(self, subset):
+        """Unique CC courses plus unarticulated courses for the UCs in `subset`."""
+        return popcount(self.unions[subset]) + sum(
+            self.unarticulated[i] for i in range(len(self.ucs)) if subset >> i & 1)
+
+    def optimal_order(self, k):
+        """
+        ([uc, ...], [(articulated, unarticulated) added by each]) for the
+        cheapest k UCs (lowest cost()), added in the order with the lowest
+        sum of running totals. Ties go to the subset/order found first in
+        `uc_list` order.
+        """
+        n = len(self.ucs)
+        if not 1 <= k <= n:
+            raise ValueError(f"k must be between 1 and {n}, got {k}")
+        best = {0: 0}     # subset → lowest sum of running totals to build it
+        last = {}         # subset → UC added last on that best path
+        frontier = [0]
+        for _ in range(k):
+            grown = {}
+            for subset in frontier:
+                for i in range(n):
+                    bit = 1 << i
+                    if subset & bit:
+                        continue
+                    bigger = subset | bit
+                    score = best[subset] + self.cost(bigger)
+                    if bigger not in grown or score < grown[bigger]:
+                        grown[bigger] = score
+                        last[bigger] = i
+            best.update(grown)
+            frontier = sorted(grown)
+
+        # cheapest final set first; the running totals only rank its orders
+        subset = min(frontier, key=lambda s: (self.cost(s), best[s]))
+        order = []
+        while subset:
+            order.append(last[subset])
+            subset ^= 1 << last[subset]
+        order.reverse()
+
+        added, taken = [], 0
+        for i in order:
+            added.append((popcount(self.courses[i] & ~taken), self.unarticulated[i]))
+            taken |= self.courses[i]
+        return [self.ucs[i] for i in order], added
+
+    def role_totals(self, k):
+        """
+        {uc: [(articulated, unarticulated)] * k}: for every ordered choice of
+        k UCs, the courses each UC adds in its position, summed.
+        """
+        n = len(self.ucs)
+        if not 1 <= k <= n:
+            raise ValueError(f"k must be between 1 and {n}, got {k}")
+        by_size = [[] for _ in range(n)]
+        for s in range(1 << n):
+            if popcount(s) < n:
+                by_size[popcount(s)].append(s)
+
+        totals = {}
+        for i, uc in enumerate(self.ucs):
+            bit = 1 << i
+            roles = []
+            for r in range(k):
+                orders_per_prefix = perm(r) * perm(n - 1 - r, k - 1 - r)
+                articulated = sum(self.new_courses(i, s) for s in by_size[r] if not s & bit)
+                roles.append((articulated * orders_per_prefix,
+                              self.unarticulated[i] * perm(n - 1, k - 1)))
+            totals[uc] = roles
+        return totals
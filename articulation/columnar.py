@@ -0,0 +1,236 @@
+"""
+Arrow/Parquet layout for the articulation datasets.
+
+The CSVs in results/, filtered_results/ and district_csvs/ have a variable
+number of "Courses Group N" columns whose cells are ";"-joined course lists,
+so every reader has to re-split them. Here each stage is written once as a
+Parquet dataset, partitioned by UC:
+
+    parquet/<stage>/uc=<UC>/part-0.parquet
+
+with one row per CSV row and these columns:
+
+    source           CC (results, filtered) or district (districts)
+    row              position of the row in its source CSV
+    college          contributing college (districts only)
+    group_id, set_id, num_required   (filtered, districts)
+    receiving        list<string>          UC courses, split on ";"
+    options          list<list<string>>    OR options, each an AND list
+    not_articulated  bool                  some cell said "Not Articulated"
+    uc               partition key: UC abbreviation (campus name for results)
+
+Readers ask for just the columns and UCs they need:
+
+    load("districts", columns=["source", "options"], ucs=["UCSD", "UCLA"])
+
+pyarrow is optional; everything else in the repo works without it.
+
+Usage:  python -m articulation.columnar            # export every stage
+        python -m articulation.columnar filtered   # just one
+"""
+
+import csv
+import glob
+import json
+import os
+import shutil
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARQUET_DIR = os.path.join(ROOT, "parquet")
+
+# stage → (CSV glob, suffix stripped from the file name to get the source)
+STAGES = {
+    "results": (os.path.join(ROOT, "results", "*_allUC.csv"), "_allUC.csv"),
+    "filtered": (os.path.join(ROOT, "filtered_results", "*_filtered.csv"), "_filtered.csv"),
+    "districts": (os.path.join(ROOT, "district_csvs", "*.csv"), ".csv"),
+}
+
+NOT_ARTICULATED = "Not Articulated"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The Parquet layout needs pyarrow: pip install pyarrow")
+
+
+def schema():
+    _require_pyarrow()
+    return pa.schema([
+        ("source", pa.string()),
+        ("row", pa.int32()),
+        ("college", pa.string()),
+        ("group_id", pa.string()),
+        ("set_id", pa.string()),
+        ("num_required", pa.int32()),
+        ("receiving", pa.list_(pa.string())),
+        ("options", pa.list_(pa.list_(pa.string()))),
+        ("not_articulated", pa.bool_()),
+        ("uc", pa.string()),
+    ])
+
+
+def split_courses(cell):
+    return [c.strip() for c in cell.split(";") if c.strip()]
+
+
+def parse_csv_row(row):
+    """
+    One DictReader row from any stage → a record in the columnar schema
+    (without source/row).
+    """
+    options = []
+    not_articulated = False
+    for key, cell in row.items():
+        if not key or not key.startswith("Courses Group"):
+            continue
+        cell = (cell or "").strip()
+        if not cell:
+            continue
+        if NOT_ARTICULATED in cell:
+            not_articulated = True
+            continue
+        options.append(split_courses(cell))
+
+    num_required = row.get("Num Required")
+    return {
+        "college": row.get("College Name"),
+        "group_id": row.get("Group ID"),
+        "set_id": row.get("Set ID"),
+        "num_required": int(num_required) if num_required else None,
+        "receiving": split_courses(row.get("Receiving") or row.get("UC Course Requirement") or ""),
+        "options": options,
+        "not_articulated": not_articulated,
+        "uc": (row.get("UC Name") or row.get("UC Campus") or "").strip(),
+    }
+
+
+def read_stage_csvs(stage):
+    pattern, suffix = STAGES[stage]
+    records = []
+    for path in sorted(glob.glob(pattern)):
+        source = os.path.basename(path)[:-len(suffix)]
+        with open(path, newline="", encoding="utf-8") as fh:
+            for i, row in enumerate(csv.DictReader(fh)):
+                rec = parse_csv_row(row)
+                rec["source"] = source
+                rec["row"] = i
+                records.append(rec)
+    return records
+
+
+def export_stage(stage, out_dir=PARQUET_DIR):
+    """
+    Rewrite parquet/<stage>/ from the stage's CSVs. Returns the row count.
+    """
+    _require_pyarrow()
+    records = read_stage_csvs(stage)
+    table = pa.Table.from_pylist(records, schema=schema())
+    target = os.path.join(out_dir, stage)
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    ds.write_dataset(
+        table, target, format="parquet",
+        partitioning=["uc"], partitioning_flavor="hive",
+        basename_template="part-{i}.parquet",
+    )
+    # "_"-prefixed files are skipped by dataset discovery; the pipeline
+    # hashes this one to tell whether the export is still on disk
+    with open(summary_path(stage, out_dir), "w", encoding="utf-8") as f:
+        json.dump({"rows": table.num_rows,
+                   "sources": sorted(set(table.column("source").to_pylist()))}, f, indent=1)
+    return table.num_rows
+
+
+def summary_path(stage, out_dir=PARQUET_DIR):
+    return os.path.join(out_dir, stage, "_summary.json")
+
+
+def dataset(stage, out_dir=PARQUET_DIR):
+    _require_pyarrow()
+    return ds.dataset(os.path.join(out_dir, stage), format="parquet", partitioning="hive")
+
+
+def load_table(stage, columns=None, ucs=None, sources=None, out_dir=PARQUET_DIR):
+    """
+    Arrow table for a stage, reading only `columns` and only the partitions
+    for `ucs`.
+    """
+    data = dataset(stage, out_dir)
+    expr = None
+    if ucs is not None:
+        expr = ds.field("uc").isin(list(ucs))
+    if sources is not None:
+        src = ds.field("source").isin(list(sources))
+        expr = src if expr is None else expr & src
+    return data.to_table(columns=columns, filter=expr)
+
+
+def load(stage, columns=None, ucs=None, sources=None, out_dir=PARQUET_DIR):
+    """
+    Same as load_table but as a pandas DataFrame (list columns stay lists).
+    """
+    return load_table(stage, columns, ucs, sources, out_dir).to_pandas()
+
+
+def to_wide(df):
+    """
+    Turn columnar rows for one source back into the CSV-shaped frame the
+    analysis scripts expect ("UC Name", "Receiving", "Courses Group N", ...).
+    """
+    import pandas as pd
+
+    df = df.sort_values("row")
+    width = max([len(o) for o in df["options"]] + [1])
+    out = pd.DataFrame()
+    if "college" in df and df["college"].notna().any():
+        out["College Name"] = df["college"].values
+    out["UC Name"] = df["uc"].values
+    for col, name in (("group_id", "Group ID"), ("set_id", "Set ID"), ("num_required", "Num Required")):
+        if col in df:
+            out[name] = df[col].values
+    out["Receiving"] = ["; ".join(r) for r in df["receiving"]]
+    for i in range(width):
+        cells = []
+        for opts, na in zip(df["options"], df["not_articulated"]):
+            if i < len(opts):
+                cells.append("; ".join(opts[i]))
+            elif i == 0 and na:
+                cells.append(NOT_ARTICULATED)
+            else:
+                cells.append(None)
+        out[f"Courses Group {i + 1}"] = cells
+    return out
+
+
+def load_frames(stage, ucs=None, out_dir=PARQUET_DIR):
+    """
+    {source: CSV-shaped DataFrame} for every source in a stage, restricted
+    to `ucs` — a drop-in for globbing the CSVs and calling pd.read_csv.
+    """
+    df = load(stage, ucs=ucs, out_dir=out_dir)
+    return {source: to_wide(rows) for source, rows in df.groupby("source", sort=True)}
+
+
+def available(stage, out_dir=PARQUET_DIR):
+    return pa is not None and os.path.isdir(os.path.join(out_dir, stage))
+
+
+def main():
+    stages = sys.argv[1:] or list(STAGES)
+    for stage in stages:
+        if stage not in STAGES:
+            print(f"❌ Unknown stage {stage!r}, expected one of {', '.join(STAGES)}")
+            sys.exit(1)
+        rows = export_stage(stage)
+        print(f"✅ {stage}: {rows} rows → {os.path.join(PARQUET_DIR, stage)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+All of filtered_results/ (or district_csvs/) as one frame, loaded once.
+
+load_corpus() concatenates every CSV in a directory with a Source column
+(the file name without its suffix) and stores the text columns as
+categoricals, which shrinks the frame to a fraction of its size and makes
+the groupbys cheap. The result is kept in memory for the life of the
+process and, when pyarrow is installed, written to
+
+    .cache/corpus/<dir>-<fingerprint>.feather
+
+so the next script to ask for the same directory memory-maps it instead of
+parsing ~100 CSVs again. The fingerprint covers every file's name, size and
+mtime, so editing or re-scraping a CSV invalidates the cache.
+
+The Q2-3 metrics are computed from the corpus:
+
+    transfer_counts(corpus)    1/0 per (source, UC)      (articulation.transferability)
+    missing_courses(corpus)    per (source, UC): counts and the
+                               "Group: course, course" lines of what is missing
+"""
+
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from articulation.columnar import ROOT
+from articulation.transferability import SOURCE, not_articulated_flags, read_corpus, transfer_counts
+
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+CACHE_DIR = os.path.join(ROOT, ".cache", "corpus")
+
+_loaded = {}
+
+__all__ = ["SOURCE", "corpus_from_frames", "load_corpus", "missing_courses", "transfer_counts"]
+
+
+def _fingerprint(paths):
+    h = hashlib.sha256()
+    for path in paths:
+        st = os.stat(path)
+        h.update(f"{os.path.basename(path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()[:16]
+
+
+def _categorical(df):
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _cache_path(directory, fingerprint):
+    name = os.path.basename(os.path.normpath(directory))
+    return os.path.join(CACHE_DIR, f"{name}-{fingerprint}.feather")
+
+
+def _write_cache(df, path):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prefix = path.rsplit("-", 1)[0] + "-"
+    for old in glob.glob(prefix + "*.feather"):
+        os.remove(old)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_feather(tmp)
+    os.replace(tmp, path)
+
+
+def corpus_from_frames(frames):
+    """The corpus for {source: DataFrame} already in memory (not cached)."""
+    return _categorical(read_corpus(frames))
+
+
+def load_corpus(directory, suffix=".csv", use_cache=True):
+    """
+    Every `*<suffix>` CSV in `directory` as one categorical frame with a
+    Source column (file name minus `suffix`), in sorted file order.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, f"*{suffix}")))
+    fingerprint = _fingerprint(paths)
+    key = (os.path.abspath(directory), suffix, fingerprint)
+    if key in _loaded:
+        return _loaded[key]
+
+    cache = _cache_path(directory, fingerprint) if use_cache and feather is not None else None
+    if cache and os.path.exists(cache):
+        corpus = feather.read_table(cache, memory_map=True).to_pandas()
+    else:
+        corpus = corpus_from_frames({os.path.basename(p)[:-len(suffix)]: pd.read_csv(p) for p in paths})
+        if cache:
+            _write_cache(corpus, cache)
+
+    _loaded[key] = corpus
+    return corpus
+
+
+def missing_courses(corpus):
+    """
+    [UC Name, counts, unarticulated_courses, Source]: for each (source, UC),
+    counts is 1 when nothing is missing, else 0 with one
+    "Group: course, course" line per unmet group (groups sorted). An unmet
+    group reports the Receiving cells of its set with the fewest of them
+    (the first set by id on ties), as UCModel.missing_receiving() does.
+    """
+    keys = [SOURCE, "UC Name", "Group ID", "Set ID"]
+    frame = corpus[keys + ["Receiving"]].astype(object)
+    frame["Receiving"] = frame["Receiving"].fillna("")
+    frame["_na"] = not_articulated_flags(corpus).to_numpy()
+    frame = frame.dropna(subset=keys)
+
+    set_na = frame.groupby(keys, sort=False)["_na"].any()
+    group_unmet = set_na.groupby(level=[0, 1, 2], sort=False).all()
+    missing = {}
+    for key, courses in frame[frame["_na"]].groupby(keys, sort=False)["Receiving"].agg(frozenset).items():
+        missing.setdefault(key[:3], {})[key[3]] = courses
+
+    details = {}
+    for (source, uc, group_id), unmet in group_unmet.items():
+        groups = details.setdefault((source, uc), {})
+        if unmet:
+            groups[group_id] = min((courses for _, courses in sorted(missing[source, uc, group_id].items())), key=len)
+
+    rows = []
+    for (source, uc), groups in details.items():
+        lines = [f"{gid}: {', '.join(sorted(courses))}" for gid, courses in sorted(groups.items())]
+        rows.append({
+            "UC Name": uc,
+            "counts": 0 if lines else 1,
+            "unarticulated_courses": "\n".join(lines),
+            SOURCE: source,
+        })
+    return pd.DataFrame(rows, columns=["UC Name", "counts", "unarticulated_courses", SOURCE])
@@ -0,0 +1,211 @@
+"""
+Compiled, in-memory form of one filtered or district CSV.
+
+Every analysis script walks the same hierarchy:
+
+    UC → group (Group ID) → set (Set ID) → requirement (one CSV row)
+       → OR options (Courses Group N) → AND courses
+
+compile_csv() / compile_frame() build it once per file; the predicates the
+scripts need are methods on it and are cached:
+
+    model = compile_csv("district_csvs/Merced_Community_College_District.csv")
+    ucsd = model.uc("UCSD")
+    ucsd.fulfillable                 # every group has a fully articulated set
+    ucsd.minimal_course_set()        # (CC courses, unarticulated UC courses)
+    ucsd.missing_receiving()         # {group: receiving of the least-missing set}
+
+Groups and sets are ordered by id, as pandas groupby orders them.
+"""
+
+import csv
+from functools import cached_property
+
+from articulation.columnar import NOT_ARTICULATED, parse_csv_row
+
+
+class Requirement:
+    __slots__ = ("receiving", "receiving_text", "options", "not_articulated")
+
+    def __init__(self, receiving, receiving_text, options, not_articulated):
+        self.receiving = frozenset(receiving)    # UC course codes
+        self.receiving_text = receiving_text     # the Receiving cell as written
+        self.options = options                   # tuple of frozensets of CC course codes
+        self.not_articulated = not_articulated   # some cell said "Not Articulated"
+
+    @property
+    def best_option(self):
+        """The option with the fewest courses (the first one on ties), or None."""
+        best = None
+        for option in self.options:
+            if best is None or len(option) < len(best):
+                best = option
+        return best
+
+
+class RequirementSet:
+    def __init__(self, set_id):
+        self.id = set_id
+        self.requirements = []
+
+    @cached_property
+    def fulfillable(self):
+        return not any(r.not_articulated for r in self.requirements)
+
+    @cached_property
+    def courses(self):
+        """Union of the cheapest option of every articulated requirement."""
+        courses = set()
+        for r in self.requirements:
+            if r.best_option:
+                courses |= r.best_option
+        return frozenset(courses)
+
+    @cached_property
+    def receiving(self):
+        return frozenset().union(*(r.receiving for r in self.requirements))
+
+    @cached_property
+    def missing(self):
+        """Receiving cells of the requirements without articulation."""
+        return frozenset(r.receiving_text for r in self.requirements if r.not_articulated)
+
+
+class Group:
+    def __init__(self, group_id):
+        self.id = group_id
+        self.sets = {}
+
+    def _sorted(self):
+        self.sets = dict(sorted(self.sets.items()))
+
+    @cached_property
+    def fulfillable(self):
+        return any(s.fulfillable for s in self.sets.values())
+
+    def cheapest_set(self):
+        """Fulfillable set needing the fewest CC courses, or None."""
+        best = None
+        for s in self.sets.values():
+            if s.fulfillable and (best is None or len(s.courses) < len(best.courses)):
+                best = s
+        return best
+
+    def first_articulated_set(self):
+        """First set with any articulated course, even if only partly articulated."""
+        for s in self.sets.values():
+            if s.courses:
+                return s
+        return None
+
+    def fallback_receiving(self):
+        """Receiving courses of the set with the fewest of them, for an unmet group."""
+        best = None
+        for s in self.sets.values():
+            if best is None or len(s.receiving) < len(best):
+                best = s.receiving
+        return best or frozenset()
+
+    def missing_receiving(self):
+        """Missing receiving cells of the least-missing set; empty if fulfillable."""
+        if self.fulfillable:
+            return frozenset()
+        return min((s.missing for s in self.sets.values()), key=len)
+
+
+class UCModel:
+    def __init__(self, name):
+        self.name = name
+        self.groups = {}
+
+    def _sorted(self):
+        self.groups = dict(sorted(self.groups.items()))
+        for group in self.groups.values():
+            group._sorted()
+
+    @cached_property
+    def fulfillable(self):
+        return all(g.fulfillable for g in self.groups.values())
+
+    def minimal_course_set(self):
+        """
+        (CC courses, UC courses left unarticulated): the cheapest fulfillable
+        set of every group, and the fallback receiving courses of the rest.
+        """
+        courses, unarticulated = set(), set()
+        for group in self.groups.values():
+            chosen = group.cheapest_set()
+            if chosen is not None:
+                courses |= chosen.courses
+            else:
+                unarticulated |= group.fallback_receiving()
+        return frozenset(courses), frozenset(unarticulated)
+
+    @cached_property
+    def course_selection(self):
+        """
+        (CC courses, UC courses left unarticulated) under the rule the
+        question_1 order analysis uses: per group, the first set with any
+        articulated course, else the fallback receiving courses.
+        """
+        courses, unarticulated = set(), set()
+        for group in self.groups.values():
+            chosen = group.first_articulated_set()
+            if chosen is not None:
+                courses |= chosen.courses
+            else:
+                unarticulated |= group.fallback_receiving()
+        return frozenset(courses), frozenset(unarticulated)
+
+    def missing_receiving(self):
+        """{group id: missing receiving cells} for every group that is not fulfillable."""
+        return {gid: g.missing_receiving() for gid, g in self.groups.items() if not g.fulfillable}
+
+
+class ArticulationModel:
+    def __init__(self):
+        self.ucs = {}   # in order of first appearance in the file
+        self._by_key = {}
+
+    def uc(self, name):
+        """UC by name, ignoring case and surrounding spaces; an empty UC if absent."""
+        return self._by_key.get(name.strip().lower()) or UCModel(name)
+
+    def add(self, uc, group_id, set_id, requirement):
+        if uc not in self.ucs:
+            self.ucs[uc] = self._by_key[uc.lower()] = UCModel(uc)
+        group = self.ucs[uc].groups.setdefault(group_id, Group(group_id))
+        group.sets.setdefault(set_id, RequirementSet(set_id)).requirements.append(requirement)
+
+    def _finish(self):
+        for uc in self.ucs.values():
+            uc._sorted()
+        return self
+
+
+def compile_rows(rows):
+    """
+    Build a model from dict rows keyed by the CSV headers ('' for empty
+    cells). Rows without a Group ID or Set ID are left out, as groupby does.
+    """
+    model = ArticulationModel()
+    for row in rows:
+        if not row.get("Group ID") or not row.get("Set ID"):
+            continue
+        rec = parse_csv_row(row)
+        not_articulated = rec["not_articulated"] or row.get("College Name") == NOT_ARTICULATED
+        requirement = Requirement(rec["receiving"], row.get("Receiving") or "",
+                                  tuple(frozenset(o) for o in rec["options"]), not_articulated)
+        model.add(rec["uc"], row["Group ID"], row["Set ID"], requirement)
+    return model._finish()
+
+
+def compile_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return compile_rows(csv.DictReader(f))
+
+
+def compile_frame(df):
+    """Same as compile_csv for a DataFrame (e.g. from articulation.columnar)."""
+    rows = df.astype(object).where(df.notna(), "").astype(str).to_dict("records")
+    return compile_rows(rows)
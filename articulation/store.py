@@ -0,0 +1,285 @@
+"""
+Normalized SQLite copy of the articulation CSVs, for ad-hoc questions like
+"which CCs articulate UCLA MATH 31A, and with what?" without globbing and
+filtering every file in pandas.
+
+    institutions      id, name, kind ('cc', 'district' or 'uc')
+    agreements        id, stage, cc_id, uc_id          one per source CSV × UC
+    requirements      id, agreement_id, uc_id, cc_id, group_id, set_id,
+                      num_required, college, receiving, not_articulated, row
+    receiving_courses requirement_id, course           UC side, split on ";"
+    options           id, requirement_id, position     OR options
+    option_courses    option_id, course                AND courses in an option
+
+stage is "results" (raw scrape), "filtered" or "districts"; for districts the
+"CC" is the district and requirements.college is the college whose row won
+the merge. UCs are stored by abbreviation in every stage.
+
+Usage:  python -m articulation.store build
+        python -m articulation.store who UCLA "MATH 31A"
+        python -m articulation.store uses "MATH 180"
+        python -m articulation.store gaps UCSD
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+from articulation.columnar import ROOT, STAGES, read_stage_csvs
+
+sys.path.insert(0, os.path.join(ROOT, "scraping"))
+from post_process import UC_ABBREVIATIONS
+
+DB_PATH = os.path.join(ROOT, "articulation.db")
+
+SCHEMA = """
+CREATE TABLE institutions (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    UNIQUE (name, kind)
+);
+CREATE TABLE agreements (
+    id    INTEGER PRIMARY KEY,
+    stage TEXT NOT NULL,
+    cc_id INTEGER NOT NULL REFERENCES institutions(id),
+    uc_id INTEGER NOT NULL REFERENCES institutions(id),
+    UNIQUE (stage, cc_id, uc_id)
+);
+CREATE TABLE requirements (
+    id              INTEGER PRIMARY KEY,
+    agreement_id    INTEGER NOT NULL REFERENCES agreements(id),
+    uc_id           INTEGER NOT NULL,
+    cc_id           INTEGER NOT NULL,
+    group_id        TEXT,
+    set_id          TEXT,
+    num_required    INTEGER,
+    college         TEXT,
+    receiving       TEXT NOT NULL,
+    not_articulated INTEGER NOT NULL,
+    row             INTEGER NOT NULL
+);
+CREATE TABLE receiving_courses (
+    requirement_id INTEGER NOT NULL REFERENCES requirements(id),
+    course         TEXT NOT NULL
+);
+CREATE TABLE options (
+    id             INTEGER PRIMARY KEY,
+    requirement_id INTEGER NOT NULL REFERENCES requirements(id),
+    position       INTEGER NOT NULL
+);
+CREATE TABLE option_courses (
+    option_id INTEGER NOT NULL REFERENCES options(id),
+    course    TEXT NOT NULL
+);
+CREATE INDEX idx_requirements_uc_group_set ON requirements (uc_id, group_id, set_id);
+CREATE INDEX idx_requirements_cc ON requirements (cc_id);
+CREATE INDEX idx_requirements_agreement ON requirements (agreement_id);
+CREATE INDEX idx_agreements_cc ON agreements (cc_id);
+CREATE INDEX idx_receiving_course ON receiving_courses (course);
+CREATE INDEX idx_receiving_requirement ON receiving_courses (requirement_id);
+CREATE INDEX idx_options_requirement ON options (requirement_id);
+CREATE INDEX idx_option_course ON option_courses (course);
+CREATE INDEX idx_option_courses_option ON option_courses (option_id);
+"""
+
+SOURCE_KIND = {"results": "cc", "filtered": "cc", "districts": "district"}
+
+
+# ------------------------------------------------------------------
+def build(db_path=DB_PATH, stages=tuple(STAGES)):
+    """
+    (Re)create the database from the stage CSVs. Returns row counts per stage.
+    """
+    tmp = db_path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    conn.executescript(SCHEMA)
+    institution_ids = {}
+    agreement_ids = {}
+
+    def institution(name, kind):
+        key = (name, kind)
+        if key not in institution_ids:
+            cur = conn.execute("INSERT INTO institutions (name, kind) VALUES (?, ?)", key)
+            institution_ids[key] = cur.lastrowid
+        return institution_ids[key]
+
+    counts = {}
+    with conn:
+        for stage in stages:
+            records = read_stage_csvs(stage)
+            counts[stage] = len(records)
+            for rec in records:
+                cc_id = institution(rec["source"].replace("_", " "), SOURCE_KIND[stage])
+                uc_id = institution(UC_ABBREVIATIONS.get(rec["uc"], rec["uc"]), "uc")
+                key = (stage, cc_id, uc_id)
+                if key not in agreement_ids:
+                    cur = conn.execute("INSERT INTO agreements (stage, cc_id, uc_id) VALUES (?, ?, ?)", key)
+                    agreement_ids[key] = cur.lastrowid
+
+                cur = conn.execute(
+                    "INSERT INTO requirements (agreement_id, uc_id, cc_id, group_id, set_id, num_required,"
+                    " college, receiving, not_articulated, row) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (agreement_ids[key], uc_id, cc_id, rec["group_id"], rec["set_id"], rec["num_required"],
+                     rec["college"], "; ".join(rec["receiving"]), int(rec["not_articulated"]), rec["row"]),
+                )
+                req_id = cur.lastrowid
+                conn.executemany("INSERT INTO receiving_courses VALUES (?, ?)",
+                                 [(req_id, c) for c in rec["receiving"]])
+                for position, option in enumerate(rec["options"]):
+                    cur = conn.execute("INSERT INTO options (requirement_id, position) VALUES (?, ?)",
+                                       (req_id, position))
+                    conn.executemany("INSERT INTO option_courses VALUES (?, ?)",
+                                     [(cur.lastrowid, c) for c in option])
+    conn.close()
+    os.replace(tmp, db_path)
+    return counts
+
+
+# ------------------------------------------------------------------
+class ArticulationDB:
+    """
+    Read-only query API over a database written by build().
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"{db_path} not found, run: python -m articulation.store build")
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _options(self, requirement_id):
+        rows = self.conn.execute(
+            "SELECT o.position, oc.course FROM options o JOIN option_courses oc ON oc.option_id = o.id"
+            " WHERE o.requirement_id = ? ORDER BY o.position, oc.rowid",
+            (requirement_id,),
+        )
+        options = {}
+        for r in rows:
+            options.setdefault(r["position"], []).append(r["course"])
+        return [options[p] for p in sorted(options)]
+
+    def _requirements(self, where, params):
+        rows = self.conn.execute(
+            "SELECT r.id, cc.name AS cc, uc.name AS uc, r.group_id, r.set_id, r.num_required,"
+            " r.college, r.receiving, r.not_articulated"
+            " FROM requirements r"
+            " JOIN agreements a ON a.id = r.agreement_id"
+            " JOIN institutions cc ON cc.id = r.cc_id"
+            " JOIN institutions uc ON uc.id = r.uc_id"
+            f" WHERE {where} ORDER BY cc.name, r.row",
+            params,
+        ).fetchall()
+        result = []
+        for r in rows:
+            item = dict(r)
+            item["not_articulated"] = bool(item["not_articulated"])
+            item["options"] = self._options(item.pop("id"))
+            result.append(item)
+        return result
+
+    def who_articulates(self, uc, course, stage="filtered"):
+        """
+        Every CC (or district) requirement that receives `course` at `uc`,
+        with its OR options.
+        """
+        return self._requirements(
+            "a.stage = ? AND uc.name = ? AND r.id IN"
+            " (SELECT requirement_id FROM receiving_courses WHERE course = ?)",
+            (stage, uc, course),
+        )
+
+    def requirements(self, cc, uc=None, stage="filtered"):
+        """
+        The rows of one CC's (or district's) agreement(s), in CSV order.
+        """
+        if uc is None:
+            return self._requirements("a.stage = ? AND cc.name = ?", (stage, cc))
+        return self._requirements("a.stage = ? AND cc.name = ? AND uc.name = ?", (stage, cc, uc))
+
+    def uses_course(self, course, stage="filtered"):
+        """
+        Requirements where the CC course `course` appears in some option.
+        """
+        return self._requirements(
+            "a.stage = ? AND r.id IN (SELECT o.requirement_id FROM options o"
+            " JOIN option_courses oc ON oc.option_id = o.id WHERE oc.course = ?)",
+            (stage, course),
+        )
+
+    def not_articulated(self, uc, stage="filtered"):
+        """
+        [(cc, receiving)] for every requirement at `uc` with no articulation.
+        """
+        rows = self.conn.execute(
+            "SELECT cc.name, r.receiving FROM requirements r"
+            " JOIN agreements a ON a.id = r.agreement_id"
+            " JOIN institutions cc ON cc.id = r.cc_id"
+            " JOIN institutions uc ON uc.id = r.uc_id"
+            " WHERE a.stage = ? AND uc.name = ? AND r.not_articulated = 1"
+            " ORDER BY cc.name, r.row",
+            (stage, uc),
+        )
+        return [tuple(r) for r in rows]
+
+    def institutions(self, kind=None):
+        if kind is None:
+            rows = self.conn.execute("SELECT name FROM institutions ORDER BY name")
+        else:
+            rows = self.conn.execute("SELECT name FROM institutions WHERE kind = ? ORDER BY name", (kind,))
+        return [r[0] for r in rows]
+
+
+# ------------------------------------------------------------------
+def _print_requirements(rows):
+    for r in rows:
+        options = " OR ".join("(" + " AND ".join(o) + ")" for o in r["options"]) or "Not Articulated"
+        where = f" via {r['college']}" if r["college"] else ""
+        print(f"{r['cc']}{where} — {r['uc']} {r['receiving']}: {options}")
+    print(f"\n{len(rows)} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the SQLite articulation store.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--stage", default="filtered", choices=list(STAGES))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="(re)create the database from the CSVs")
+    who = sub.add_parser("who", help="which CCs articulate a UC course")
+    who.add_argument("uc")
+    who.add_argument("course")
+    uses = sub.add_parser("uses", help="requirements a CC course satisfies")
+    uses.add_argument("course")
+    gaps = sub.add_parser("gaps", help="unarticulated requirements at a UC")
+    gaps.add_argument("uc")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        counts = build(args.db)
+        print(f"✅ {args.db}: " + ", ".join(f"{n} {stage} rows" for stage, n in counts.items()))
+        return
+
+    with ArticulationDB(args.db) as db:
+        if args.command == "who":
+            _print_requirements(db.who_articulates(args.uc, args.course, args.stage))
+        elif args.command == "uses":
+            _print_requirements(db.uses_course(args.course, args.stage))
+        else:
+            for cc, receiving in db.not_articulated(args.uc, args.stage):
+                print(f"{cc}: {receiving}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Vectorized "can a student transfer to this UC" check over many CSVs at once.
+
+A UC is transferable from a college when every one of its groups has at
+least one set with no "Not Articulated" row. Here the whole corpus is one
+frame with a source column, the "Not Articulated" flag is computed once
+per row, and the set → group → UC reduction is three grouped any/all:
+
+    flags:    row has "Not Articulated" in a course group (or, in district
+              files, as the winning college)
+    set ok:   not any(flags)      per (source, UC, group, set)
+    group ok: any(set ok)         per (source, UC, group)
+    UC ok:    all(group ok)       per (source, UC)
+
+Rows without a Group ID or Set ID drop out of the grouping, as before.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+NOT_ARTICULATED = "Not Articulated"
+SOURCE = "Source"
+
+
+def read_corpus(frames):
+    """
+    One frame for {source: DataFrame}, with the source in a SOURCE column.
+    """
+    corpus = pd.concat(list(frames.values()), ignore_index=True)
+    corpus[SOURCE] = np.repeat(list(frames), [len(df) for df in frames.values()])
+    return corpus
+
+
+def read_csvs(paths, source_of=os.path.basename):
+    return read_corpus({source_of(p): pd.read_csv(p) for p in paths})
+
+
+def not_articulated_flags(df):
+    course_cols = [c for c in df.columns if c.startswith("Courses Group")]
+    flags = pd.Series(False, index=df.index)
+    for col in course_cols:
+        flags |= df[col].astype("string").str.contains(NOT_ARTICULATED, regex=False).fillna(False).astype(bool)
+    if "College Name" in df.columns:
+        flags |= (df["College Name"] == NOT_ARTICULATED).to_numpy()
+    return flags
+
+
+def transferable(df):
+    """
+    Boolean Series indexed by (source, UC Name): can every group be met?
+    Sources and UCs keep their order of first appearance.
+    """
+    keys = [df[SOURCE], df["UC Name"], df["Group ID"], df["Set ID"]]
+    # observed=True: with categorical keys (articulation.corpus) pandas < 3
+    # would add every unseen combination as an empty, "satisfied" set
+    set_ok = ~not_articulated_flags(df).groupby(keys, sort=False, observed=True).any()
+    group_ok = set_ok.groupby(level=[0, 1, 2], sort=False, observed=True).any()
+    return group_ok.groupby(level=[0, 1], sort=False, observed=True).all().rename_axis([SOURCE, "UC Name"])
+
+
+def transfer_matrix(df):
+    """Source × UC matrix of 1 (transferable) / 0, NaN where a UC is missing."""
+    return transferable(df).astype(int).unstack("UC Name")
+
+
+def transfer_counts(df):
+    """
+    Long form [UC Name, counts, SOURCE], one row per (source, UC) — the
+    shape the Q2-3 plotting code pivots.
+    """
+    ok = transferable(df).astype(int).rename("counts").reset_index()
+    return ok[["UC Name", "counts", SOURCE]].astype({"UC Name": str, SOURCE: str})
@@ -3,13 +3,14 @@ import pandas as pd
 import json
 from collections import defaultdict
 
-def count_total_courses(row, course_group_cols):
-    """Helper to count total required courses (count semicolons across all course groups)."""
-    total = 0
+def total_courses(df, course_group_cols):
+    """Total required courses per row (count semicolons across all course groups), as one column."""
+    total = pd.Series(0, index=df.index)
     for col in course_group_cols:
-        cell = str(row.get(col, ""))
-        if cell and cell != "Not Articulated":
-            total += cell.count(';') + 1  # Semicolons mean multiple required courses
+        # compared as str(cell), so empty cells (read as NaN → "nan") count as one course
+        cells = df[col].fillna('nan').astype(str)
+        counted = (cells != '') & (cells != 'Not Articulated')
+        total += (cells.str.count(';') + 1).where(counted, 0)  # Semicolons mean multiple required courses
     return total
 
 # --- Determine paths based on script location ---
@@ -20,79 +21,96 @@ districts_json_path = os.path.join(script_dir, 'districts.json')
 input_folder        = os.path.join(root_dir, 'filtered_results')
 output_folder       = os.path.join(root_dir, 'district_csvs')
 
-# Make sure output folder exists
-os.makedirs(output_folder, exist_ok=True)
+def load_college_to_district(path=districts_json_path):
+    """Build college -> district lookup from districts.json."""
+    with open(path, 'r') as f:
+        districts_data = json.load(f)['districts']
 
-# --- Load district mapping ---
-with open(districts_json_path, 'r') as f:
-    districts_data = json.load(f)['districts']
+    college_to_district = {}
+    for district, info in districts_data.items():
+        for college in info['colleges']:
+            college_to_district[college] = district
+    return college_to_district
 
-# Build college -> district lookup
-college_to_district = {}
-for district, info in districts_data.items():
-    for college in info['colleges']:
-        college_to_district[college] = district
+def college_name_of(filename):
+    return filename.replace('_filtered.csv', '').replace('_', ' ')
 
-# --- Collect data by district ---
-district_data = defaultdict(list)
+def district_csv_path(district):
+    safe_name = district.replace(' ', '_').replace('/', '_')
+    return os.path.join(output_folder, f"{safe_name}.csv")
 
-print(f"Reading all college CSVs from: {input_folder}")
-for filename in os.listdir(input_folder):
-    if not filename.endswith('.csv'):
-        continue
+def read_college_csv(file_path):
+    df = pd.read_csv(file_path)
+    df.insert(0, 'College Name', college_name_of(os.path.basename(file_path)))
+    return df
 
-    college_name = filename.replace('_filtered.csv', '').replace('_', ' ')
-    file_path    = os.path.join(input_folder, filename)
-    df           = pd.read_csv(file_path)
-
-    if college_name not in college_to_district:
-        print(f"  ⚠️  Warning: {college_name} not found in districts.json, skipping.")
-        continue
-
-    district_name = college_to_district[college_name]
-    df.insert(0, 'College Name', college_name)
-    district_data[district_name].append(df)
-
-# --- Merge and pick best articulations per district ---
-print("\nCombining into district files...")
-for district, dfs in district_data.items():
+def merge_district(dfs):
+    """Pick the best articulation per (UC, group, set, receiving) across a district's colleges."""
     combined = pd.concat(dfs, ignore_index=True)
 
     # Identify course‐group columns
     base_cols         = ['College Name', 'UC Name', 'Group ID', 'Set ID', 'Num Required', 'Receiving']
     course_group_cols = [c for c in combined.columns if c not in base_cols]
-
-    final_rows = []
-    grouped    = combined.groupby(['UC Name', 'Group ID', 'Set ID', 'Receiving'])
-
-    for _, group_df in grouped:
-        # Prefer articulated rows
-        articulated = group_df[group_df['Courses Group 1'] != 'Not Articulated']
-
-        if not articulated.empty:
-            # Take the one with fewest total courses
-            articulated = articulated.copy()
-            articulated['Total Courses'] = articulated.apply(
-                lambda r: count_total_courses(r, course_group_cols), axis=1
-            )
-            best_row = articulated.sort_values('Total Courses').iloc[0].drop('Total Courses')
-        else:
-            # Make a synthetic “Not Articulated” row
-            example_row = group_df.iloc[0].copy()
-            example_row['College Name']    = 'Not Articulated'
-            example_row['Courses Group 1'] = 'Not Articulated'
-            for col in course_group_cols[1:]:
-                example_row[col] = ''
-            best_row = example_row
-
-        final_rows.append(best_row)
-
-    final_df = pd.DataFrame(final_rows)
-
-    # Write out
-    safe_name      = district.replace(' ', '_').replace('/', '_')
-    out_csv        = os.path.join(output_folder, f"{safe_name}.csv")
+    keys              = ['UC Name', 'Group ID', 'Set ID', 'Receiving']
+
+    # Rows with a missing key never formed a group before either
+    combined = combined[combined[keys].notna().all(axis=1)]
+
+    # Prefer articulated rows, then the one with fewest total courses; the
+    # stable sort keeps the first college on ties
+    ranked = combined.assign(
+        _not_articulated=combined['Courses Group 1'] == 'Not Articulated',
+        _total=total_courses(combined, course_group_cols),
+    )
+    ranked = ranked.sort_values(keys + ['_not_articulated', '_total'], kind='mergesort')
+    best = ranked.drop_duplicates(keys, keep='first')
+
+    # Groups with no articulated row at all become a synthetic “Not Articulated” row
+    missing = best['_not_articulated']
+    best = best.drop(columns=['_not_articulated', '_total'])
+    # (where() rather than .loc so an all-empty float column can take '')
+    best['College Name']    = best['College Name'].where(~missing, 'Not Articulated')
+    best['Courses Group 1'] = best['Courses Group 1'].where(~missing, 'Not Articulated')
+    for col in course_group_cols[1:]:
+        best[col] = best[col].where(~missing, '')
+
+    return best
+
+def build_district(district, college_files):
+    """Merge the given filtered college CSVs into district_csvs/<district>.csv."""
+    final_df = merge_district([read_college_csv(p) for p in college_files])
+    out_csv  = district_csv_path(district)
     final_df.to_csv(out_csv, index=False)
-    print(f"  ✓ Saved {out_csv}")
-
-print("\nAll district CSVs created successfully!")
+    return out_csv
+
+def district_inputs(college_to_district=None):
+    """district -> list of filtered college CSVs that belong to it (directory order, as before)."""
+    if college_to_district is None:
+        college_to_district = load_college_to_district()
+    inputs = defaultdict(list)
+    for filename in os.listdir(input_folder):
+        if not filename.endswith('.csv'):
+            continue
+        college_name = college_name_of(filename)
+        if college_name not in college_to_district:
+            print(f"  ⚠️  Warning: {college_name} not found in districts.json, skipping.")
+            continue
+        inputs[college_to_district[college_name]].append(os.path.join(input_folder, filename))
+    return inputs
+
+def main():
+    # Make sure output folder exists
+    os.makedirs(output_folder, exist_ok=True)
+
+    print(f"Reading all college CSVs from: {input_folder}")
+    inputs = district_inputs()
+
+    print("\nCombining into district files...")
+    for district, college_files in inputs.items():
+        out_csv = build_district(district, college_files)
+        print(f"  ✓ Saved {out_csv}")
+
+    print("\nAll district CSVs created successfully!")
+
+if __name__ == "__main__":
+    main()
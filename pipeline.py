@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Incremental runner for the whole pipeline (README Steps 2–4):
+
+    results/<CC>_allUC.csv
+        → filtered_results/<CC>_filtered.csv        (scraping/post_process.py)
+        → district_csvs/<District>.csv              (creating_districts/creating_district_csvs.py)
+        → question_1 order CSVs / txts and graphs   (question_1/scripts_for_*)
+        → question_2-3 heatmaps and bar plots       (question_2-3/*/*.py)
+        → articulation.db                           (articulation/store.py)
+
+Every task declares the files it reads (including its own script) and the
+files it writes. The content hash of each is stored in .pipeline_state.json.
+On the next run a task is skipped when its inputs hash the same as last
+time and its outputs are still on disk unchanged, so re-scraping one CC only
+refreshes that CC, its district file, and the aggregates built on top.
+
+A dry run writes nothing, so it marks the outputs of every task it would
+run as changed; tasks further down that read them are listed too. Tasks
+that only a real run would discover (e.g. the district file of a CC that
+has never been filtered) are not.
+
+Usage:  python pipeline.py            # rebuild whatever is out of date
+        python pipeline.py --dry-run  # list what would run
+        python pipeline.py --force    # rebuild everything
+        python pipeline.py --parquet  # also export each stage to parquet/
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(ROOT, ".pipeline_state.json")
+# file_hash() of an output a dry-run task would have rewritten
+WOULD_CHANGE = "<would change>"
+
+SCRAPING_DIR = os.path.join(ROOT, "scraping")
+DISTRICTS_DIR = os.path.join(ROOT, "creating_districts")
+Q1_DIR = os.path.join(ROOT, "question_1")
+Q23_DIR = os.path.join(ROOT, "question_2-3")
+
+sys.path.insert(0, ROOT)
+sys.path.insert(0, SCRAPING_DIR)
+sys.path.insert(0, DISTRICTS_DIR)
+sys.path.insert(0, os.path.join(Q1_DIR, "scripts_for_data"))
+
+
+def rel(path):
+    return os.path.relpath(path, ROOT)
+
+
+# ------------------------------------------------------------------
+class Task:
+    def __init__(self, name, inputs, outputs, action):
+        self.name = name
+        self.inputs = sorted(rel(p) for p in inputs)
+        self.outputs = sorted(rel(p) for p in outputs)
+        self.action = action
+
+
+class Pipeline:
+    def __init__(self, state_path=STATE_PATH, force=False, dry_run=False):
+        self.state_path = state_path
+        self.force = force
+        self.dry_run = dry_run
+        self.state = self._load_state()
+        self._hashes = {}
+        self.ran, self.skipped = [], []
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+    def file_hash(self, path):
+        if path not in self._hashes:
+            full = os.path.join(ROOT, path)
+            if not os.path.exists(full):
+                self._hashes[path] = None
+            else:
+                h = hashlib.sha256()
+                with open(full, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 16), b""):
+                        h.update(chunk)
+                self._hashes[path] = h.hexdigest()
+        return self._hashes[path]
+
+    def _hashes_of(self, paths):
+        return {p: self.file_hash(p) for p in paths}
+
+    def is_stale(self, task):
+        if self.force:
+            return True
+        recorded = self.state.get(task.name)
+        if not recorded:
+            return True
+        if recorded["inputs"] != self._hashes_of(task.inputs):
+            return True
+        # outputs deleted or edited by hand since the last run
+        return recorded["outputs"] != self._hashes_of(task.outputs)
+
+    def run(self, task):
+        if not self.is_stale(task):
+            self.skipped.append(task.name)
+            return
+        self.ran.append(task.name)
+        print(f"▶ {task.name}")
+        if self.dry_run:
+            # carry the staleness forward to the tasks that read these
+            for p in task.outputs:
+                self._hashes[p] = WOULD_CHANGE
+            return
+        task.action()
+        self.record(task)
+
+    def record(self, task):
+        """Store the hashes of a task that has just run (here or elsewhere)."""
+        for p in task.outputs:
+            self._hashes.pop(p, None)
+        self.state[task.name] = {
+            "inputs": self._hashes_of(task.inputs),
+            "outputs": self._hashes_of(task.outputs),
+        }
+        self._save_state()
+
+
+# ------------------------------------------------------------------
+def run_script(script, cwd=None):
+    env = dict(os.environ, MPLBACKEND="Agg")  # figures only, no windows
+    subprocess.run([sys.executable, script], cwd=cwd or os.path.dirname(script), env=env, check=True)
+
+
+def filter_tasks():
+    import post_process
+
+    scripts = [os.path.join(SCRAPING_DIR, "post_process.py"),
+               os.path.join(SCRAPING_DIR, "files", "course_reqs.py")]
+    tasks = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "results", "*_allUC.csv"))):
+        cc = os.path.basename(path).replace("_allUC.csv", "")
+        out = os.path.join(ROOT, "filtered_results", f"{cc}_filtered.csv")
+
+        def action(path=path, cc=cc):
+            _, rows, _, _ = post_process.scan_csv(path)
+            post_process.save_filtered_csv(cc, rows, verbose=False)
+
+        tasks.append(Task(f"filter:{cc}", [path] + scripts, [out], action))
+    return tasks
+
+
+def district_tasks():
+    import creating_district_csvs as cdc
+
+    os.makedirs(cdc.output_folder, exist_ok=True)
+    scripts = [os.path.join(DISTRICTS_DIR, "creating_district_csvs.py"), cdc.districts_json_path]
+    tasks = []
+    for district, college_files in sorted(cdc.district_inputs().items()):
+        def action(district=district, college_files=college_files):
+            cdc.build_district(district, college_files)
+
+        tasks.append(Task(f"district:{district}", college_files + scripts,
+                          [cdc.district_csv_path(district)], action))
+    return tasks
+
+
+def aggregate_tasks():
+    import total_combination_order as tco
+
+    district_files = sorted(glob.glob(os.path.join(ROOT, "district_csvs", "*.csv")))
+    filtered_files = sorted(glob.glob(os.path.join(ROOT, "filtered_results", "*_filtered.csv")))
+    order_csvs = [os.path.join(tco.ORDER_CSV_DIR, f"order_{i}_averages.csv") for i in range(1, 4)]
+    # shared helpers the analysis scripts import from articulation/
+    model = [os.path.join(ROOT, "articulation", n)
+             for n in ("model.py", "columnar.py", "bitset.py", "transferability.py", "corpus.py")]
+    graphs = os.path.join(Q1_DIR, "graphs")
+    q1_graph_scripts = os.path.join(Q1_DIR, "scripts_for_graphs")
+
+    def q1_data():
+        tco.process_all_csvs(tco.DISTRICT_DIR, txt_dir=tco.TXT_DIR, csv_dir=tco.ORDER_CSV_DIR)
+
+    def script_task(name, script, inputs, outputs):
+        return Task(name, [script] + inputs, outputs, lambda: run_script(script))
+
+    return [
+        Task("q1:combination-order",
+             district_files + model + [os.path.join(Q1_DIR, "scripts_for_data", "total_combination_order.py")],
+             order_csvs + [os.path.join(tco.ORDER_CSV_DIR, "optimal_order_k3.csv")]
+             + [os.path.join(tco.TXT_DIR, n) for n in
+                ("total_combination_order.txt", "average_combination_order.txt", "excluded_cc_uc_pairs.txt")],
+             q1_data),
+        script_task("q1:graphs", os.path.join(q1_graph_scripts, "make_graphs.py"),
+                    order_csvs + [os.path.join(Q1_DIR, "data_txts", "untrasferrable_ccs.txt")]
+                    + [os.path.join(q1_graph_scripts, n) for n in
+                       ("heat_map_transferrable_ccs.py", "grouped_bar_graph.py", "untransferrable_ccs.py")],
+                    [os.path.join(graphs, "heat_maps_per_order", f"heatmap_order_{i}.png") for i in range(1, 4)]
+                    + [os.path.join(graphs, "grouped_bar_transferable_averages_by_uc.png"),
+                       os.path.join(graphs, "untransferrable_districts.png")]),
+        script_task("q2-3:cc-level", os.path.join(Q23_DIR, "cc-level", "least_options.py"),
+                    filtered_files + model,
+                    [os.path.join(Q23_DIR, "cc-level", "transfer_availability_heatmap.png"),
+                     os.path.join(Q23_DIR, "cc-level", "total_transfer_availability.png")]),
+        script_task("q2-3:cc-level-detailed", os.path.join(Q23_DIR, "cc-level", "detailed_least_options.py"),
+                    filtered_files + model,
+                    [os.path.join(Q23_DIR, "cc-level", "detailed_transfer_availability_heatmap.png")]),
+        script_task("q2-3:district-level", os.path.join(Q23_DIR, "district-level", "district_least_options.py"),
+                    district_files + model,
+                    [os.path.join(Q23_DIR, "district-level", "district_transfer_availability_heatmap.png"),
+                     os.path.join(Q23_DIR, "district-level", "district_total_transfer_availability.png")]),
+    ]
+
+
+def database_tasks():
+    from articulation import store
+    from articulation.columnar import STAGES
+
+    inputs = [os.path.join(ROOT, "articulation", "store.py")]
+    for pattern, _ in STAGES.values():
+        inputs += glob.glob(pattern)
+    return [Task("sqlite:articulation.db", inputs, [store.DB_PATH], lambda: store.build())]
+
+
+def parquet_tasks():
+    from articulation import columnar
+
+    module = os.path.join(ROOT, "articulation", "columnar.py")
+    tasks = []
+    for stage, (pattern, _) in columnar.STAGES.items():
+        def action(stage=stage):
+            columnar.export_stage(stage)
+
+        tasks.append(Task(f"parquet:{stage}", sorted(glob.glob(pattern)) + [module],
+                          [columnar.summary_path(stage)], action))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild pipeline artifacts whose inputs changed.")
+    parser.add_argument("--force", action="store_true", help="rebuild everything")
+    parser.add_argument("--dry-run", action="store_true", help="only list the tasks that would run")
+    parser.add_argument("--parquet", action="store_true",
+                        help="also export results, filtered and district CSVs to parquet/ (needs pyarrow)")
+    args = parser.parse_args()
+
+    pipeline = Pipeline(force=args.force, dry_run=args.dry_run)
+    # stages are planned one after another: the tasks of a later stage are
+    # only known once the earlier stage has written its files
+    stages = [filter_tasks, district_tasks, aggregate_tasks, database_tasks]
+    if args.parquet:
+        stages.append(parquet_tasks)
+    for stage in stages:
+        for task in stage():
+            pipeline.run(task)
+
+    print(f"\n✅ {len(pipeline.ran)} tasks {'would run' if args.dry_run else 'ran'}, "
+          f"{len(pipeline.skipped)} up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,114 +1,126 @@
 import pandas as pd
-from itertools import permutations
+import argparse
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+from math import perm
 
 uc_schools = ["UCSD", "UCSB", "UCSC", "UCLA", "UCB", "UCI", "UCD", "UCR", "UCM"]
 
-def generate_combinations(uc_schools):
-    return list(permutations(uc_schools, 3))
-
-def count_required_courses(df, selected_schools, articulated_tracker, unarticulated_tracker):
-    df.columns = df.columns.str.strip()
-    df['UC Name'] = df['UC Name'].str.lower().str.strip()
-    selected_schools = [school.lower().strip() for school in selected_schools]
-    filtered_df = df[df['UC Name'].isin(selected_schools)]
-
-    articulated_courses = set()
-    unarticulated_courses = set()
-
-    for (uc, group_id), group_df in filtered_df.groupby(['UC Name', 'Group ID']):
-        fulfilled = False
-        fallback_receiving = None
-
-        for set_id, set_df in group_df.groupby('Set ID'):
-            all_cc_courses = set()
-            all_receiving_courses = set()
-
-            for _, row in set_df.iterrows():
-                receiving = [r.strip() for r in str(row['Receiving']).split(';') if r.strip()]
-                all_receiving_courses.update(receiving)
-
-                best_option = None
-                for col in row.index:
-                    if col.lower().startswith("courses group"):
-                        val = str(row[col]).strip()
-                        if val and val.lower() != "not articulated" and val.lower() != "nan":
-                            option = [v.strip() for v in val.split(';') if v.strip()]
-                            if best_option is None or len(option) < len(best_option):
-                                best_option = option
-                if best_option:
-                    all_cc_courses.update(best_option)
-
-            if all_cc_courses:
-                fulfilled = True
-                new_courses = all_cc_courses - set(c for (_, c) in articulated_tracker)
-                articulated_courses.update((uc, course) for course in new_courses)
-                break
-
-            if fallback_receiving is None or len(all_receiving_courses) < len(fallback_receiving):
-                fallback_receiving = all_receiving_courses
-
-        if not fulfilled and fallback_receiving:
-            for course in fallback_receiving:
-                unarticulated_courses.add((uc, course))
-
-    new_articulated = articulated_courses - articulated_tracker
-    new_unarticulated = unarticulated_courses - unarticulated_tracker
-
-    articulated_tracker.update(new_articulated)
-    unarticulated_tracker.update(new_unarticulated)
-
-    return len(new_articulated), len(new_unarticulated)
-
-def process_combinations_order_sensitive(df, uc_list):
-    all_combinations = generate_combinations(uc_list)
-
-    uc_role_totals = {
-        uc: {'1st': {'articulated': 0, 'unarticulated': 0},
-             '2nd': {'articulated': 0, 'unarticulated': 0},
-             '3rd': {'articulated': 0, 'unarticulated': 0}} for uc in uc_list
+# Paths relative to the repo, so the script runs from any working directory
+script_dir = os.path.dirname(os.path.abspath(__file__))
+question_dir = os.path.dirname(script_dir)
+root_dir = os.path.dirname(question_dir)
+DISTRICT_DIR = os.path.join(root_dir, "district_csvs")
+FILTERED_DIR = os.path.join(root_dir, "filtered_results")
+TXT_DIR = os.path.join(question_dir, "data_txts")
+ORDER_CSV_DIR = os.path.join(question_dir, "order_csvs")
+
+# corpus → (folder, prefix for its output files)
+CORPORA = {
+    "districts": (DISTRICT_DIR, ""),
+    "ccs": (FILTERED_DIR, "cc_"),
+}
+
+sys.path.insert(0, root_dir)
+from articulation.bitset import UCBitsets
+from articulation.model import compile_csv
+
+def ordinal(n):
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+def process_combinations_order_sensitive(model, uc_list, k=3):
+    # Totals over every ordered choice of k UCs (the 504 permutations for k=3).
+    # A course already taken for an earlier UC is not counted again; the UCs'
+    # course selections are bitmasks, so each step is an AND and a popcount.
+    return role_totals(UCBitsets(model, uc_list), k)
+
+def role_totals(bits, k):
+    totals = bits.role_totals(k)
+    return {
+        uc: {ordinal(idx + 1): {'articulated': art, 'unarticulated': unart}
+             for idx, (art, unart) in enumerate(totals[uc])}
+        for uc in bits.ucs
     }
 
-    for uc1, uc2, uc3 in all_combinations:
-        articulated_tracker = set()
-        unarticulated_tracker = set()
-
-        for idx, uc in enumerate([uc1, uc2, uc3]):
-            role = f"{idx + 1}st" if idx == 0 else f"{idx + 1}nd" if idx == 1 else f"{idx + 1}rd"
-            art_count, unart_count = count_required_courses(
-                df, [uc], articulated_tracker, unarticulated_tracker
-            )
-            uc_role_totals[uc][role]['articulated'] += art_count
-            uc_role_totals[uc][role]['unarticulated'] += unart_count
-
-    return uc_role_totals
-
-def process_all_csvs(folder_path):
-    total_txt = "total_combination_order.txt"
-    avg_txt = "average_combination_order.txt"
-    excluded_txt = "excluded_cc_uc_pairs.txt"
-
+def optimal_order_row(file_name, bits, k):
+    # Cheapest k UCs, in the order that keeps the running total lowest, and what each adds
+    order, added = bits.optimal_order(k)
+    row = {
+        "Community College": file_name,
+        "Order": " > ".join(order),
+        "Total Courses": sum(art + unart for art, unart in added),
+        "Total Unarticulated": sum(unart for _, unart in added),
+    }
+    for idx, (uc, (art, unart)) in enumerate(zip(order, added)):
+        role = ordinal(idx + 1)
+        row[f"{role} UC"] = uc
+        row[f"{role} Articulated"] = art
+        row[f"{role} Unarticulated"] = unart
+    return row
+
+def write_optimal_orders(rows, k, csv_dir=".", corpus_prefix=""):
+    df = pd.DataFrame(rows)
+    avg_row = {"Community College": "AVERAGE"}
+    for col in df.columns[1:]:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            avg_row[col] = round(df[col].mean(), 2)
+    df = pd.concat([df, pd.DataFrame([avg_row])], ignore_index=True)
+    df.to_csv(os.path.join(csv_dir, f"{corpus_prefix}optimal_order_k{k}.csv"), index=False)
+
+def output_prefix(k):
+    # k=3 keeps the original file names
+    return "" if k == 3 else f"k{k}_"
+
+def analyze_file(file_path, k=3):
+    # Worker: everything the reports need from one CC/district file
+    bits = UCBitsets(compile_csv(file_path), uc_schools)
+    file = os.path.basename(file_path)
+    return {"file": file, "totals": role_totals(bits, k), "optimal": optimal_order_row(file, bits, k)}
+
+def analyze_files(file_paths, k=3, pool=None):
+    # Results come back in `file_paths` order whichever worker finishes first
+    if pool is None:
+        return [analyze_file(path, k) for path in file_paths]
+    return list(pool.map(analyze_file, file_paths, repeat(k), chunksize=4))
+
+def process_all_csvs(folder_path, txt_dir=".", csv_dir=".", k=3, pool=None, corpus_prefix=""):
+    prefix = corpus_prefix + output_prefix(k)
+    total_txt = os.path.join(txt_dir, f"{prefix}total_combination_order.txt")
+    avg_txt = os.path.join(txt_dir, f"{prefix}average_combination_order.txt")
+    excluded_txt = os.path.join(txt_dir, f"{prefix}excluded_cc_uc_pairs.txt")
+
+    roles = [ordinal(i + 1) for i in range(k)]
+    # how often each UC lands in each role across all orders (56 for k=3)
+    orders_per_role = perm(len(uc_schools) - 1, k - 1)
+
+    csv_files = sorted(f for f in os.listdir(folder_path) if f.endswith('.csv'))
+    analyses = analyze_files([os.path.join(folder_path, f) for f in csv_files], k, pool)
+
+    # Everything below only reduces `analyses`, so the reports are the same
+    # for a serial and a parallel run
     open(total_txt, 'w').close()
     open(avg_txt, 'w').close()
     open(excluded_txt, 'w').close()
 
     overall_totals = {
-        uc: {'1st': {'articulated': 0, 'unarticulated': 0},
-             '2nd': {'articulated': 0, 'unarticulated': 0},
-             '3rd': {'articulated': 0, 'unarticulated': 0}} for uc in uc_schools
+        uc: {role: {'articulated': 0, 'unarticulated': 0} for role in roles} for uc in uc_schools
     }
 
-    csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
     average_results_list = []
+    optimal_rows = []
 
-    for idx, file in enumerate(csv_files):
+    for idx, analysis in enumerate(analyses):
+        file = analysis["file"]
         print(f"Processing {idx+1}/{len(csv_files)}: {file}")
-        file_path = os.path.join(folder_path, file)
-        df = pd.read_csv(file_path)
-        results = process_combinations_order_sensitive(df, uc_schools)
+        results = analysis["totals"]
+        optimal_rows.append(analysis["optimal"])
 
         for uc in uc_schools:
-            for role in ['1st', '2nd', '3rd']:
+            for role in roles:
                 overall_totals[uc][role]['articulated'] += results[uc][role]['articulated']
                 overall_totals[uc][role]['unarticulated'] += results[uc][role]['unarticulated']
 
@@ -116,7 +128,7 @@ def process_all_csvs(folder_path):
             f.write(f"--- Processing {file} ---\n\n")
             for uc in uc_schools:
                 f.write(f"{uc}:\n")
-                for role in ['1st', '2nd', '3rd']:
+                for role in roles:
                     art = results[uc][role]['articulated']
                     unart = results[uc][role]['unarticulated']
                     f.write(f"  As {role}: {art} Courses, {unart} Unarticulated\n")
@@ -124,9 +136,9 @@ def process_all_csvs(folder_path):
 
         avg = {
             uc: {role: {
-                'articulated': round(results[uc][role]['articulated'] / 56, 2),
-                'unarticulated': round(results[uc][role]['unarticulated'] / 56, 2)
-            } for role in ['1st', '2nd', '3rd']} for uc in uc_schools
+                'articulated': round(results[uc][role]['articulated'] / orders_per_role, 2),
+                'unarticulated': round(results[uc][role]['unarticulated'] / orders_per_role, 2)
+            } for role in roles} for uc in uc_schools
         }
         average_results_list.append(avg)
 
@@ -134,7 +146,7 @@ def process_all_csvs(folder_path):
             f.write(f"--- Processing {file} ---\n\n")
             for uc in uc_schools:
                 f.write(f"{uc}:\n")
-                for role in ['1st', '2nd', '3rd']:
+                for role in roles:
                     art = avg[uc][role]['articulated']
                     unart = avg[uc][role]['unarticulated']
                     f.write(f"  As {role}: {art} Courses, {unart} Unarticulated\n")
@@ -145,7 +157,7 @@ def process_all_csvs(folder_path):
         f.write("\n--- Grand Totals Across All Files ---\n\n")
         for uc in uc_schools:
             f.write(f"{uc}:\n")
-            for role in ['1st', '2nd', '3rd']:
+            for role in roles:
                 art = overall_totals[uc][role]['articulated']
                 unart = overall_totals[uc][role]['unarticulated']
                 f.write(f"  As {role}: {art} Courses, {unart} Unarticulated\n")
@@ -155,7 +167,7 @@ def process_all_csvs(folder_path):
         f.write("--- Averages (Total ÷ # Files) ---\n\n")
         for uc in uc_schools:
             f.write(f"{uc}:\n")
-            for role in ['1st', '2nd', '3rd']:
+            for role in roles:
                 art_avg = round(overall_totals[uc][role]['articulated'] / n, 2)
                 unart_avg = round(overall_totals[uc][role]['unarticulated'] / n, 2)
                 f.write(f"  As {role}: {art_avg} Courses, {unart_avg} Unarticulated\n")
@@ -166,7 +178,7 @@ def process_all_csvs(folder_path):
         n = len(average_results_list)
         for uc in uc_schools:
             f.write(f"{uc}:\n")
-            for role in ['1st', '2nd', '3rd']:
+            for role in roles:
                 art_total = sum(avg[uc][role]['articulated'] for avg in average_results_list)
                 unart_total = sum(avg[uc][role]['unarticulated'] for avg in average_results_list)
                 art_avg = round(art_total / n, 2)
@@ -175,7 +187,7 @@ def process_all_csvs(folder_path):
             f.write("\n")
 
     # Create per-order average CSVs with filtered average row
-    for idx, role in enumerate(['1st', '2nd', '3rd']):
+    for idx, role in enumerate(roles):
         data = []
         filtered_pairs = []
         filtered_sum = {}
@@ -215,7 +227,7 @@ def process_all_csvs(folder_path):
                 transfer_avg_row[col] = 0.0
         df = pd.concat([df, pd.DataFrame([transfer_avg_row])], ignore_index=True)
 
-        df.to_csv(f"order_{idx+1}_averages.csv", index=False)
+        df.to_csv(os.path.join(csv_dir, f"{prefix}order_{idx+1}_averages.csv"), index=False)
 
         # Append filtered average to average_combination_order.txt
         with open(avg_txt, "a") as f:
@@ -236,6 +248,27 @@ def process_all_csvs(folder_path):
                 f.write(f"{cc}: {ucs}\n")
             f.write("\n")
 
+    write_optimal_orders(optimal_rows, k, csv_dir, corpus_prefix)
+
+def main():
+    parser = argparse.ArgumentParser(description="Order-sensitive course totals over k-UC application orders.")
+    parser.add_argument("--k", type=int, default=3,
+                        help=f"number of UCs applied to, 1-{len(uc_schools)} (default 3)")
+    parser.add_argument("--corpus", choices=[*CORPORA, "both"], default="districts",
+                        help="district_csvs/ (default), filtered_results/ (outputs prefixed cc_), or both")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes; 0 = one per core (default 1 = serial)")
+    args = parser.parse_args()
+    if not 1 <= args.k <= len(uc_schools):
+        parser.error(f"--k must be between 1 and {len(uc_schools)}")
+
+    corpora = list(CORPORA) if args.corpus == "both" else [args.corpus]
+    jobs = args.jobs or os.cpu_count()
+    with (ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext()) as pool:
+        for corpus in corpora:
+            folder, corpus_prefix = CORPORA[corpus]
+            process_all_csvs(folder, txt_dir=TXT_DIR, csv_dir=ORDER_CSV_DIR, k=args.k,
+                             pool=pool, corpus_prefix=corpus_prefix)
+
 if __name__ == "__main__":
-    folder_path = "/workspaces/assist_web_scraping/district_csvs"
-    process_all_csvs(folder_path)
\ No newline at end of file
+    main()
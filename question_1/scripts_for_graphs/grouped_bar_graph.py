@@ -1,50 +1,58 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+import os
 
 # List of UC campuses
 uc_schools = ["UCSD", "UCSB", "UCSC", "UCLA", "UCB", "UCI", "UCD", "UCR", "UCM"]
 
-# Load and extract TRANSFERABLE AVERAGE row from each order CSV
-order_dfs = []
-for i in range(1, 4):
-    df = pd.read_csv(f"order_{i}_averages.csv")
-    transferable_row = df[df["Community College"] == "TRANSFERABLE AVERAGE"]
-    if not transferable_row.empty:
-        transferable_row["Order"] = f"Order {i}"
-        order_dfs.append(transferable_row)
-
-# Reformat into long-form for plotting
-records = []
-for df in order_dfs:
-    order = df["Order"].values[0]
-    for uc in uc_schools:
-        art_col = f"{uc} Articulated"
-        if art_col in df.columns:
-            records.append({
-                "UC": uc,
-                "Order": order,
-                "Average Courses": df[art_col].values[0]
-            })
-
-plot_df = pd.DataFrame(records)
-
-# Pivot to get each UC with average per order
-pivot_df = plot_df.pivot(index="UC", columns="Order", values="Average Courses")
-
-# Plot grouped bar chart
-ax = pivot_df.plot(kind="bar", figsize=(12, 6), colormap="tab10")
-plt.title("Transferable Average Articulated Courses by UC and Order")
-plt.ylabel("Average Articulated Courses")
-plt.xlabel("University of California")
-plt.xticks(rotation=0)
-plt.tight_layout()
-plt.legend(title="Order")
-
-# Annotate values above bars
-for container in ax.containers:
-    ax.bar_label(container, fmt="%.1f", label_type="edge", padding=3, fontsize=8)
-
-# Save the figure
-plt.savefig("transferable_averages_by_uc.png", dpi=300, bbox_inches='tight')
-
-plt.show()
\ No newline at end of file
+# Paths relative to the repo, so the script runs from any working directory
+script_dir = os.path.dirname(os.path.abspath(__file__))
+question_dir = os.path.dirname(script_dir)
+ORDER_CSV_DIR = os.path.join(question_dir, "order_csvs")
+GRAPHS_DIR = os.path.join(question_dir, "graphs")
+ORDERS = range(1, 4)
+OUTPUT_PATH = os.path.join(GRAPHS_DIR, "grouped_bar_transferable_averages_by_uc.png")
+
+
+def transferable_averages(orders):
+    """
+    UC × "Order N" matrix of the TRANSFERABLE AVERAGE articulated courses,
+    from {order: order CSV DataFrame}.
+    """
+    rows = pd.concat(
+        [df[df["Community College"] == "TRANSFERABLE AVERAGE"].assign(Order=f"Order {order}")
+         for order, df in orders.items()],
+        ignore_index=True,
+    )
+    art_cols = [f"{uc} Articulated" for uc in uc_schools if f"{uc} Articulated" in rows.columns]
+    long = rows.melt(id_vars="Order", value_vars=art_cols, var_name="UC", value_name="Average Courses")
+    long["UC"] = long["UC"].str.removesuffix(" Articulated")
+    return long.pivot(index="UC", columns="Order", values="Average Courses")
+
+
+def plot_grouped_bar(pivot_df, output_path):
+    # Plot grouped bar chart
+    fig, ax = plt.subplots(figsize=(12, 6))
+    pivot_df.plot(kind="bar", colormap="tab10", ax=ax)
+    ax.set_title("Transferable Average Articulated Courses by UC and Order")
+    ax.set_ylabel("Average Articulated Courses")
+    ax.set_xlabel("University of California")
+    plt.setp(ax.get_xticklabels(), rotation=0)
+    fig.tight_layout()
+    ax.legend(title="Order")
+
+    # Annotate values above bars
+    for container in ax.containers:
+        ax.bar_label(container, fmt="%.1f", label_type="edge", padding=3, fontsize=8)
+
+    fig.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
+def main():
+    orders = {order: pd.read_csv(os.path.join(ORDER_CSV_DIR, f"order_{order}_averages.csv")) for order in ORDERS}
+    plot_grouped_bar(transferable_averages(orders), OUTPUT_PATH)
+
+
+if __name__ == "__main__":
+    main()
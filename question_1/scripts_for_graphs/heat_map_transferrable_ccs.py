@@ -2,75 +2,95 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.patches as mpatches
-
-sns.set(style="white", font_scale=0.9)
+from matplotlib.colors import ListedColormap
+import os
 
 uc_schools = ["UCSD", "UCSB", "UCSC", "UCLA", "UCB", "UCI", "UCD", "UCR", "UCM"]
 
-# Load and prepare data for heatmap per order
-for order in range(1, 4):
-    df = pd.read_csv(f"question_1/order_csvs/order_{order}_averages.csv")
-
-    # Remove average rows
-    df_filtered = df[~df["Community College"].isin(["AVERAGE", "TRANSFERABLE AVERAGE"])]
-
-    # Sort community colleges alphabetically
-    df_filtered = df_filtered.sort_values("Community College")
-
-    # Prepare matrices for heatmap and mask
-    articulated_matrix = pd.DataFrame(index=df_filtered["Community College"], columns=uc_schools)
-    mask_matrix = pd.DataFrame(False, index=df_filtered["Community College"], columns=uc_schools)
-
-    for _, row in df_filtered.iterrows():
-        cc = row["Community College"]
-        for uc in uc_schools:
-            art_col = f"{uc} Articulated"
-            unart_col = f"{uc} Unarticulated"
-            articulated_matrix.loc[cc, uc] = row[art_col]
-            if row[unart_col] > 0:
-                mask_matrix.loc[cc, uc] = True
-
-    articulated_matrix = articulated_matrix.astype(float)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(14, max(6, len(articulated_matrix) * 0.4)))
-    sns.heatmap(
-        articulated_matrix,
-        mask=mask_matrix,
-        annot=True,
-        fmt=".1f",
-        cmap="YlGnBu",
-        cbar_kws={'label': 'Avg. Articulated Courses'},
-        linewidths=0.5,
-        linecolor='white', 
-        ax=ax
-    )
-
-    # Red overlay for non-transferable (masked) cells
-    for y in range(mask_matrix.shape[0]):
-        for x in range(mask_matrix.shape[1]):
-            if mask_matrix.iloc[y, x]:
-                ax.add_patch(
-                    plt.Rectangle(
-                        (x, y), 1, 1,
-                        fill=True,
-                        facecolor='lightcoral',
-                        edgecolor='white',
-                        linewidth=0.5  # <- key to gridline visibility
-                    )
-                )
-
-
-    # Add legend patch
-    red_patch = mpatches.Patch(color='lightcoral', label='Untransferable')
-    ax.legend(handles=[red_patch], loc='upper right', bbox_to_anchor=(1.15, 1.02))
-
-    ax.set_title(f"Transferable Course Heatmap - Order {order}", fontsize=14, weight='bold')
-    ax.set_xlabel("University of California", fontsize=11)
-    ax.set_ylabel("Community College", fontsize=11)
-
-    plt.xticks(rotation=30, ha='right')
-    plt.yticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig(f"heatmap_order_{order}.png", dpi=300)
-    plt.show()
+# Paths relative to the repo, so the script runs from any working directory
+script_dir = os.path.dirname(os.path.abspath(__file__))
+question_dir = os.path.dirname(script_dir)
+ORDER_CSV_DIR = os.path.join(question_dir, "order_csvs")
+GRAPHS_DIR = os.path.join(question_dir, "graphs")
+ORDERS = range(1, 4)
+
+
+def order_csv(order):
+    return os.path.join(ORDER_CSV_DIR, f"order_{order}_averages.csv")
+
+
+def heatmap_path(order):
+    return os.path.join(GRAPHS_DIR, "heat_maps_per_order", f"heatmap_order_{order}.png")
+
+
+def heatmap_matrices(df):
+    """
+    (articulated, untransferable) College × UC matrices for one order CSV:
+    the average articulated courses, and whether any course is unarticulated.
+    """
+    # Remove average rows, sort community colleges alphabetically
+    df = df[~df["Community College"].isin(["AVERAGE", "TRANSFERABLE AVERAGE"])]
+    long = df.melt(id_vars="Community College", var_name="column", value_name="value")
+    long = long[long["column"].str.endswith((" Articulated", " Unarticulated"))]
+    long[["UC", "kind"]] = long["column"].str.split(" ", n=1, expand=True)
+
+    def matrix(kind):
+        values = long[long["kind"] == kind].pivot(index="Community College", columns="UC", values="value")
+        return values.reindex(columns=uc_schools).sort_index().astype(float)
+
+    return matrix("Articulated"), matrix("Unarticulated") > 0
+
+
+def plot_heatmap(order, articulated, untransferable, output_path):
+    # seaborn's theme only for this figure, so other figures rendered in the
+    # same process keep the matplotlib defaults
+    with plt.rc_context():
+        sns.set_theme(style="white", font_scale=0.9)
+
+        fig, ax = plt.subplots(figsize=(14, max(6, len(articulated) * 0.4)))
+        sns.heatmap(
+            articulated,
+            mask=untransferable,
+            annot=True,
+            fmt=".1f",
+            cmap="YlGnBu",
+            cbar_kws={'label': 'Avg. Articulated Courses'},
+            linewidths=0.5,
+            linecolor='white',
+            ax=ax
+        )
+
+        # Red overlay for non-transferable cells, as one more mesh
+        sns.heatmap(
+            untransferable.astype(float),
+            mask=~untransferable,
+            cmap=ListedColormap(['lightcoral']),
+            cbar=False,
+            linewidths=0.5,
+            linecolor='white',
+            ax=ax
+        )
+
+        # Add legend patch
+        red_patch = mpatches.Patch(color='lightcoral', label='Untransferable')
+        ax.legend(handles=[red_patch], loc='upper right', bbox_to_anchor=(1.15, 1.02))
+
+        ax.set_title(f"Transferable Course Heatmap - Order {order}", fontsize=14, weight='bold')
+        ax.set_xlabel("University of California", fontsize=11)
+        ax.set_ylabel("Community College", fontsize=11)
+
+        plt.setp(ax.get_xticklabels(), rotation=30, ha='right')
+        plt.setp(ax.get_yticklabels(), rotation=0)
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=300)
+        plt.close(fig)
+
+
+def main():
+    for order in ORDERS:
+        articulated, untransferable = heatmap_matrices(pd.read_csv(order_csv(order)))
+        plot_heatmap(order, articulated, untransferable, heatmap_path(order))
+
+
+if __name__ == "__main__":
+    main()
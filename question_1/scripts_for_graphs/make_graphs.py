@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Renders every question_1 graph in one go:
+
+    graphs/heat_maps_per_order/heatmap_order_{1,2,3}.png   (heat_map_transferrable_ccs.py)
+    graphs/grouped_bar_transferable_averages_by_uc.png     (grouped_bar_graph.py)
+    graphs/untransferrable_districts.png                   (untransferrable_ccs.py)
+
+The order CSVs and the untransferrable txt are read once here and the
+figures are drawn headless (Agg) in a process pool. Like pipeline.py, each
+figure records the content hashes of its inputs (the data files and the
+scripts that draw it) in .graph_state.json, and is skipped while those and
+the PNG itself are unchanged.
+
+Usage:  python make_graphs.py            # redraw figures whose inputs changed
+        python make_graphs.py --force    # redraw everything
+        python make_graphs.py --jobs 1   # no worker processes
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+
+import matplotlib
+matplotlib.use("Agg")  # files only, also in the worker processes
+
+import pandas as pd
+
+import grouped_bar_graph
+import heat_map_transferrable_ccs as heat_map
+import untransferrable_ccs
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(script_dir))
+sys.path.insert(0, ROOT)
+from pipeline import Pipeline, Task
+
+STATE_PATH = os.path.join(ROOT, ".graph_state.json")
+
+
+def script(module):
+    return os.path.join(script_dir, f"{module.__name__}.py")
+
+
+def load_orders():
+    return {order: pd.read_csv(heat_map.order_csv(order)) for order in heat_map.ORDERS}
+
+
+def graph_tasks(orders=None):
+    """
+    One Task per figure. The data is only loaded (once) if `orders` is not
+    given; actions are picklable so they can run in another process.
+    """
+    orders = load_orders() if orders is None else orders
+    shared = [os.path.abspath(__file__)]
+    tasks = []
+    for order, df in orders.items():
+        articulated, untransferable = heat_map.heatmap_matrices(df)
+        output = heat_map.heatmap_path(order)
+        tasks.append(Task(f"graph:heatmap_order_{order}",
+                          [heat_map.order_csv(order), script(heat_map)] + shared, [output],
+                          partial(heat_map.plot_heatmap, order, articulated, untransferable, output)))
+
+    tasks.append(Task("graph:grouped_bar",
+                      [heat_map.order_csv(order) for order in orders] + [script(grouped_bar_graph)] + shared,
+                      [grouped_bar_graph.OUTPUT_PATH],
+                      partial(grouped_bar_graph.plot_grouped_bar,
+                              grouped_bar_graph.transferable_averages(orders), grouped_bar_graph.OUTPUT_PATH)))
+
+    tasks.append(Task("graph:untransferrable",
+                      [untransferrable_ccs.file_path, script(untransferrable_ccs)] + shared,
+                      [untransferrable_ccs.OUTPUT_PATH],
+                      partial(untransferrable_ccs.plot_untransferrable,
+                              untransferrable_ccs.count_untransferrable(), untransferrable_ccs.OUTPUT_PATH)))
+    return tasks
+
+
+def _run(action):
+    action()
+
+
+def make_graphs(force=False, jobs=0):
+    """Redraw the stale figures; returns (names drawn, names up to date)."""
+    pipeline = Pipeline(state_path=STATE_PATH, force=force)
+    tasks = graph_tasks()
+    stale = [t for t in tasks if pipeline.is_stale(t)]
+    for task in stale:
+        os.makedirs(os.path.dirname(os.path.join(ROOT, task.outputs[0])), exist_ok=True)
+        print(f"▶ {task.name}")
+
+    workers = min(jobs or os.cpu_count() or 1, len(stale))
+    with ProcessPoolExecutor(workers) if workers > 1 else nullcontext() as pool:
+        mapper = map if pool is None else pool.map
+        # results come back in task order; record each figure once it is drawn
+        for task, _ in zip(stale, mapper(_run, [t.action for t in stale])):
+            pipeline.record(task)
+
+    return [t.name for t in stale], [t.name for t in tasks if t not in stale]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the question_1 graphs whose inputs changed.")
+    parser.add_argument("--force", action="store_true", help="redraw every figure")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="worker processes (0 = one per CPU, 1 = render in this process)")
+    args = parser.parse_args()
+
+    drawn, skipped = make_graphs(force=args.force, jobs=args.jobs)
+    print(f"\n✅ {len(drawn)} figures drawn, {len(skipped)} up to date")
+
+
+if __name__ == "__main__":
+    main()
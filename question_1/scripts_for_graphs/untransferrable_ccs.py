@@ -1,39 +1,57 @@
 import matplotlib.pyplot as plt
+import os
+
+# Paths relative to the repo, so the script runs from any working directory
+script_dir = os.path.dirname(os.path.abspath(__file__))
+question_dir = os.path.dirname(script_dir)
+GRAPHS_DIR = os.path.join(question_dir, "graphs")
 
 # File path to your TXT file
-file_path = "/workspaces/assist_web_scraping/question_1/data_txts/untrasferrable_ccs.txt"  # <-- update this!
+file_path = os.path.join(question_dir, "data_txts", "untrasferrable_ccs.txt")
+OUTPUT_PATH = os.path.join(GRAPHS_DIR, "untransferrable_districts.png")
 
-# Initialize count for each UC
 uc_list = ["UCSD", "UCSB", "UCSC", "UCLA", "UCB", "UCI", "UCD", "UCR", "UCM"]
-untransferrable_counts = {uc: 0 for uc in uc_list}
-
-# Read the file and count untransferrable UCs
-with open(file_path, 'r') as f:
-    for line in f:
-        if ':' not in line:
-            continue
-        _, uc_str = line.strip().split(':')
-        uc_str = uc_str.strip()
-        if not uc_str:
-            continue
-        ucs = [uc.strip() for uc in uc_str.split(',') if uc.strip()]
-        for uc in ucs:
-            if uc in untransferrable_counts:
-                untransferrable_counts[uc] += 1
-
-# Plotting
-plt.figure(figsize=(10, 6))
-bars = plt.bar(untransferrable_counts.keys(), untransferrable_counts.values(), color='indianred')
-
-# Add value labels
-for bar in bars:
-    height = bar.get_height()
-    plt.text(bar.get_x() + bar.get_width()/2., height + 0.2, str(height), ha='center', va='bottom')
-
-plt.title("Number of Districts Untransferrable to Each UC")
-plt.xlabel("UC")
-plt.ylabel("Untransferrable District Count")
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig("untransferrable_districts_from_txt.png")
-plt.show()
+
+
+def count_untransferrable(path=file_path):
+    # Count, for each UC, the districts listing it as untransferrable
+    untransferrable_counts = {uc: 0 for uc in uc_list}
+    with open(path, 'r') as f:
+        for line in f:
+            if ':' not in line:
+                continue
+            _, uc_str = line.strip().split(':')
+            uc_str = uc_str.strip()
+            if not uc_str:
+                continue
+            ucs = [uc.strip() for uc in uc_str.split(',') if uc.strip()]
+            for uc in ucs:
+                if uc in untransferrable_counts:
+                    untransferrable_counts[uc] += 1
+    return untransferrable_counts
+
+
+def plot_untransferrable(untransferrable_counts, output_path):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(untransferrable_counts.keys(), untransferrable_counts.values(), color='indianred')
+
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.2, str(height), ha='center', va='bottom')
+
+    ax.set_title("Number of Districts Untransferrable to Each UC")
+    ax.set_xlabel("UC")
+    ax.set_ylabel("Untransferrable District Count")
+    plt.setp(ax.get_xticklabels(), rotation=45)
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+
+def main():
+    plot_untransferrable(count_untransferrable(), OUTPUT_PATH)
+
+
+if __name__ == "__main__":
+    main()
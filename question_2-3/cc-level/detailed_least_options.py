@@ -1,208 +1,151 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
+import argparse
+import html
 import os
+import sys
+import textwrap
+from matplotlib.collections import PathCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
 
-def can_transfer_to_uc(df, uc_name):
-    # Get all requirements for this UC
-    uc_requirements = df[df['UC Name'] == uc_name]
-    unarticulated_courses = []
-    
-    # Group requirements by Group ID to handle sets
-    grouped_reqs = uc_requirements.groupby('Group ID')
-    
-    # Check each group of requirements
-    for group_id, group_data in grouped_reqs:
-        # If there are multiple Set IDs, only one needs to be satisfied
-        set_ids = group_data['Set ID'].unique()
-        if len(set_ids) > 1:
-            # Check if at least one set is satisfied
-            set_satisfied = False
-            best_set_unarticulated = []
-            min_unarticulated = float('inf')
-            
-            for set_id in set_ids:
-                set_data = group_data[group_data['Set ID'] == set_id]
-                current_set_unarticulated = []
-                
-                for _, row in set_data.iterrows():
-                    for col in [col for col in df.columns if col.startswith('Courses Group')]:
-                        if pd.notna(row[col]) and 'Not Articulated' in str(row[col]):
-                            current_set_unarticulated.append(row['Receiving'])
-                            
-                if len(current_set_unarticulated) == 0:
-                    set_satisfied = True
-                    break
-                elif len(current_set_unarticulated) < min_unarticulated:
-                    min_unarticulated = len(current_set_unarticulated)
-                    best_set_unarticulated = current_set_unarticulated
-                    
-            if not set_satisfied:
-                unarticulated_courses.extend(best_set_unarticulated)
-        else:
-            # Single set ID - all courses must be satisfied
-            for _, row in group_data.iterrows():
-                for col in [col for col in df.columns if col.startswith('Courses Group')]:
-                    if pd.notna(row[col]) and 'Not Articulated' in str(row[col]):
-                        unarticulated_courses.append(row['Receiving'])
-    
-    return unarticulated_courses
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..')))
+from articulation.corpus import SOURCE, load_corpus, missing_courses
 
-def count_transfer_options(file_path):
-    """
-    Reads a “_filtered.csv” articulation file and returns:
-      - college_name
-      - DataFrame with columns [UC Name, counts, unarticulated_courses]
-        where `unarticulated_courses` is a '\n'-joined list of
-        "Group X: course1, course2, …" lines.
-    """
-    df = pd.read_csv(file_path)
-    college_name = os.path.basename(file_path).replace('_filtered.csv', '')
-    
-    records = []
-    for uc in df['UC Name'].unique():
-        uc_df = df[df['UC Name'] == uc]
-        # gather unarticulated courses by group, considering Set IDs
-        grouped = {}
-        for group_id, group_data in uc_df.groupby('Group ID'):
-            # Check if this group has multiple Set IDs
-            set_ids = group_data['Set ID'].unique()
-            if len(set_ids) > 1:
-                # For multiple Set IDs, check if any set is fully articulated
-                set_satisfied = False
-                best_set_courses = None
-                min_unarticulated = float('inf')
-                
-                for set_id in set_ids:
-                    set_data = group_data[group_data['Set ID'] == set_id]
-                    current_set_unarticulated = set()
-                    
-                    for _, row in set_data.iterrows():
-                        for col in [c for c in df.columns if c.startswith('Courses Group')]:
-                            if pd.notna(row[col]) and 'Not Articulated' in str(row[col]):
-                                current_set_unarticulated.add(row['Receiving'])
-                    
-                    if len(current_set_unarticulated) == 0:
-                        set_satisfied = True
-                        break
-                    elif len(current_set_unarticulated) < min_unarticulated:
-                        min_unarticulated = len(current_set_unarticulated)
-                        best_set_courses = current_set_unarticulated
-                
-                if not set_satisfied and best_set_courses:
-                    grouped[group_id] = best_set_courses
-            else:
-                # Single Set ID - check all courses
-                unarticulated = set()
-                for _, row in group_data.iterrows():
-                    for col in [c for c in df.columns if c.startswith('Courses Group')]:
-                        if pd.notna(row[col]) and 'Not Articulated' in str(row[col]):
-                            unarticulated.add(row['Receiving'])
-                if unarticulated:
-                    grouped[group_id] = unarticulated
-        
-        # build the multi-line string
-        if grouped:
-            lines = []
-            for gid, courses in sorted(grouped.items()):
-                courses_list = sorted(courses)
-                lines.append(f"{gid}: {', '.join(courses_list)}")
-            detail = "\n".join(lines)
-            count = 0
-        else:
-            detail = ""    # fully articulated → blank cell
-            count = 1
-    
-        records.append({
-            'UC Name': uc,
-            'counts': count,
-            'unarticulated_courses': detail
-        })
-    
-    return college_name, pd.DataFrame(records)
-    
 def analyze_all_colleges(directory):
-    all_data = []
-    
-    # Process all CSV files in the directory
-    for file in os.listdir(directory):
-        if file.endswith('_filtered.csv'):
-            file_path = os.path.join(directory, file)
-            college_name, transfer_counts = count_transfer_options(file_path)
-            
-            # Add college name to each row
-            transfer_counts['College'] = college_name
-            all_data.append(transfer_counts)
-    
-    # Combine all data
-    combined_data = pd.concat(all_data, ignore_index=True)
-    return combined_data
-
-def create_heatmap(data):
     """
-    Creates two files:
-      - transfer_availability_heatmap.png  (binary 0/1 overview)
-      - detailed_transfer_availability_heatmap.png
-    The detailed version overlays each group’s missing courses
-    on the red cells, one line per group.
+    One row per (college, UC) with columns [UC Name, counts,
+    unarticulated_courses, College], where `unarticulated_courses` is a
+    '\n'-joined list of "Group X: course1, course2, …" lines (blank when
+    every group can be met) — all from the shared filtered_results corpus.
     """
-    # --- binary overview (unchanged) ---
-    # plt.figure(figsize=(20, 30))
-    # hm = data.pivot(index='College', columns='UC Name', values='counts')
-    # sns.heatmap(hm, annot=True, cmap='RdYlGn', fmt='g', vmin=0, vmax=1)
-    # plt.title('Valid Transfer Paths to UCs\n(1 = all articulated, 0 = some missing)', pad=20)
-    # plt.ylabel('Community College')
-    # plt.xlabel('UC Campus')
-    # plt.xticks(rotation=30, ha='right')
-    # plt.tight_layout()
-    # plt.savefig('transfer_availability_heatmap.png', dpi=300, bbox_inches='tight')
-    # plt.close()
-
-    # --- detailed view with per-group lines ---
-    plt.figure(figsize=(30, 80))
+    corpus = load_corpus(directory, '_filtered.csv')
+    return missing_courses(corpus).rename(columns={SOURCE: 'College'})
+
+# Detailed heatmap layout: the full 115-college figure is 30 x 80 inches
+FIG_WIDTH = 30
+ROW_HEIGHT = 80 / 115      # inches per college
+DPI = 300
+CELL_CHARS = 48            # wrap annotation lines to about one cell width
+LABEL_FONT = FontProperties(size=8, weight='bold')
+LINE_SPACING = 1.2
+# --fast: paginated, lower-resolution pages instead of the one 300 dpi figure
+FAST_PER_PAGE = 25
+FAST_DPI = 150
+OUTPUT_NAME = 'detailed_transfer_availability_heatmap'
+
+def detailed_matrix(data):
+    """College × UC matrix of missing-course text, NaN where nothing is missing."""
     detailed = data.pivot(index='College', columns='UC Name', values='unarticulated_courses')
     # blank → NaN so that isna()==True means "good" → green
-    detailed = detailed.replace('', np.nan)
-    status = detailed.isna().astype(int)
-
-    sns.heatmap(
-        status,
-        cmap='RdYlGn',
-        cbar=False,
-        vmin=0,
-        vmax=1,
-        linewidths=1,
-        linecolor='black',
-        square=False,  # Allow rectangular cells
-        annot=False
-    )
-
-    # overlay each cell’s multi-line detail
-    for i, college in enumerate(detailed.index):
-        for j, uc in enumerate(detailed.columns):
-            text = detailed.iat[i, j]
-            if pd.notna(text):
-                plt.text(
-                    j + 0.5, i + 0.5,
-                    text,
-                    ha='center', va='center',
-                    wrap=True, fontsize=8,
-                    color='white', fontweight='bold'
-                )
-
-    plt.title('Detailed Articulation (Green = OK, Red = Missing)', pad=20)
-    plt.ylabel('Community College')
-    plt.xlabel('UC Campus')
-    plt.xticks(rotation=30, ha='right')
-    plt.yticks(rotation=0)
-    plt.tight_layout()
-    detailed_out = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        'detailed_transfer_availability_heatmap.png'
-    )
-    plt.savefig(detailed_out, dpi=300, bbox_inches='tight')
-    plt.close()
+    return detailed.replace('', np.nan)
+
+def wrap_cell(text):
+    return "\n".join(textwrap.fill(line, CELL_CHARS, subsequent_indent='  ') for line in text.split("\n"))
+
+def label_path(text):
+    """Glyph outlines of a wrapped cell label, centred on (0, 0), in points."""
+    lines = wrap_cell(text).split("\n")
+    size = LABEL_FONT.get_size_in_points()
+    step = size * LINE_SPACING
+    paths = []
+    for n, line in enumerate(lines):
+        if not line.strip():
+            continue
+        glyphs = TextPath((0, 0), line, prop=LABEL_FONT)
+        left, right = glyphs.vertices[:, 0].min(), glyphs.vertices[:, 0].max()
+        # top line first; 0.35em drops the baseline so the line's middle sits on y
+        y = ((len(lines) - 1) / 2 - n) * step - 0.35 * size
+        paths.append(glyphs.transformed(Affine2D().translate(-(left + right) / 2, y)))
+    return Path.make_compound_path(*paths)
+
+def render_page(detailed, output_path, title, dpi=DPI):
+    rows, cols = detailed.shape
+    status = detailed.isna().to_numpy(dtype=float)
+
+    fig, ax = plt.subplots(figsize=(FIG_WIDTH, max(4, ROW_HEIGHT * rows)))
+    # the whole grid, borders included, is one QuadMesh
+    ax.pcolormesh(status, cmap='RdYlGn', vmin=0, vmax=1, edgecolors='black', linewidth=1)
+    ax.set_xlim(0, cols)
+    ax.set_ylim(rows, 0)
+
+    # every label is laid out once, as glyph outlines, and drawn as one
+    # PathCollection: sized in points, placed at the cell centres
+    text = detailed.to_numpy()
+    missing = list(zip(*np.nonzero(status == 0)))
+    if missing:
+        labels = PathCollection(
+            [label_path(text[i, j]) for i, j in missing],
+            offsets=[(j + 0.5, i + 0.5) for i, j in missing], offset_transform=ax.transData,
+            transform=Affine2D().scale(1 / 72) + fig.dpi_scale_trans,
+            facecolors='white', edgecolors='none')
+        labels.set_in_layout(False)  # inside the grid; spares the tight bbox measuring every glyph
+        ax.add_collection(labels, autolim=False)
+
+    ax.set_xticks(np.arange(cols) + 0.5, detailed.columns, rotation=30, ha='right')
+    ax.set_yticks(np.arange(rows) + 0.5, detailed.index, rotation=0)
+    ax.set_title(title, pad=20)
+    ax.set_ylabel('Community College')
+    ax.set_xlabel('UC Campus')
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+def create_heatmap(data, per_page=None, dpi=DPI, output_dir=None):
+    """
+    Writes detailed_transfer_availability_heatmap.png: green where every
+    group is articulated, red with each group's missing courses (one line
+    per group) where not. With `per_page`, writes one
+    detailed_transfer_availability_heatmap_page<N>.png per `per_page`
+    colleges instead. Returns the paths written.
+
+    The defaults give the original figure (one page, 300 dpi, tight bbox);
+    `per_page` and a lower `dpi` are for quick looks (see --fast).
+    """
+    output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    detailed = detailed_matrix(data)
+    title = 'Detailed Articulation (Green = OK, Red = Missing)'
+
+    if not per_page:
+        path = os.path.join(output_dir, f'{OUTPUT_NAME}.png')
+        render_page(detailed, path, title, dpi)
+        return [path]
+
+    pages = range(0, len(detailed), per_page)
+    paths = []
+    for n, start in enumerate(pages, 1):
+        path = os.path.join(output_dir, f'{OUTPUT_NAME}_page{n}.png')
+        render_page(detailed.iloc[start:start + per_page], path, f'{title} — page {n}/{len(pages)}', dpi)
+        paths.append(path)
+    return paths
+
+def write_html(data, output_path):
+    """The detailed matrix as a standalone HTML table (searchable, no rendering cost)."""
+    detailed = detailed_matrix(data)
+    header = "".join(f"<th>{html.escape(str(uc))}</th>" for uc in detailed.columns)
+    body = []
+    for college, row in detailed.iterrows():
+        cells = "".join(
+            '<td class="ok"></td>' if pd.isna(text)
+            else f'<td class="missing">{html.escape(text).replace(chr(10), "<br>")}</td>'
+            for text in row
+        )
+        body.append(f"<tr><th>{html.escape(str(college))}</th>{cells}</tr>")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            "<title>Detailed Articulation</title><style>"
+            "table{border-collapse:collapse;font:12px sans-serif}"
+            "th,td{border:1px solid #000;padding:4px;vertical-align:top}"
+            "thead th{position:sticky;top:0;background:#fff}"
+            "td.ok{background:#1a9850}td.missing{background:#d73027;color:#fff;font-weight:bold}"
+            "</style></head><body>\n<h1>Detailed Articulation (Green = OK, Red = Missing)</h1>\n"
+            f"<table><thead><tr><th>Community College</th>{header}</tr></thead><tbody>\n"
+            + "\n".join(body) + "\n</tbody></table></body></html>\n"
+        )
 
 # def create_bar_plot(data):
 #     # Calculate total transfer options per college
@@ -221,6 +164,20 @@ def create_heatmap(data):
 #     plt.close()
 
 def main():
+    parser = argparse.ArgumentParser(description="Which UC requirements each community college is missing.")
+    parser.add_argument("--per-page", type=int, default=None,
+                        help="split the detailed heatmap into pages of this many colleges")
+    parser.add_argument("--dpi", type=int, default=None, help=f"resolution of the PNGs (default {DPI})")
+    parser.add_argument("--fast", action="store_true",
+                        help=f"write {FAST_PER_PAGE}-college pages at {FAST_DPI} dpi instead of the full "
+                             f"{DPI} dpi figure (--per-page / --dpi still override)")
+    parser.add_argument("--html", action="store_true",
+                        help="also write detailed_transfer_availability.html")
+    args = parser.parse_args()
+    if args.fast:
+        args.per_page = args.per_page or FAST_PER_PAGE
+        args.dpi = args.dpi or FAST_DPI
+
     # Directory containing the filtered CSV files
     script_dir = os.path.dirname(os.path.abspath(__file__))
     directory = os.path.normpath(os.path.join(script_dir, '../../filtered_results'))
@@ -229,7 +186,9 @@ def main():
     combined_data = analyze_all_colleges(directory)
     
     # Create visualizations
-    create_heatmap(combined_data)
+    create_heatmap(combined_data, per_page=args.per_page, dpi=args.dpi or DPI)
+    if args.html:
+        write_html(combined_data, os.path.join(script_dir, 'detailed_transfer_availability.html'))
     # create_bar_plot(combined_data)
     
     # Find college with fewest options
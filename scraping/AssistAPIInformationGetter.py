@@ -1,4 +1,7 @@
-import requests
+import json
+import os
+import time
+from assist_client import get_client
 '''
 This file contains multiple functions that return information from the assist.org api
 For more information on the api, look at the github readme on the repo in the articulation doc
@@ -10,10 +13,7 @@ CCsdups = {"Compton College": "Compton Community College", "Santa Ana College":
            "Berkeley City College":"Vista Community College"}
 # gets the API data from the correct url as specified through APIType
 def getAPIData(APIType):
-    BacicURL = "https://assist.org/api/"
-    endpoint = APIType
-    data = requests.get(BacicURL + endpoint).json()
-    return data
+    return get_client().get_json(APIType)
 
 # 
 # def GetRepeatCCs():
@@ -25,53 +25,88 @@ def getAPIData(APIType):
 #     return Repeats
 # GetRepeatCCs()
 
+# where the institutions payload is kept between runs, and for how long
+INSTITUTIONS_CACHE = os.path.join(".cache", "institutions.json")
+INSTITUTIONS_TTL = 7 * 24 * 3600
+
+# Loads the institutions list once (from disk if it is fresh, otherwise from the API)
+# and indexes it so lookups by id, by any of an institution's names, or by
+# CC / category do not rescan the whole list
+class InstitutionRegistry:
+    def __init__(self, cache_path=INSTITUTIONS_CACHE, ttl=INSTITUTIONS_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.institutions = self._load()
+        self.by_id = {}
+        self.by_name = {}
+        self.by_category = {}
+        self.cc_ids = []
+        for inst in self.institutions:
+            self.by_id[inst.get("id")] = inst
+            for names in inst.get("names", []):
+                # first institution wins, same as the old linear scan
+                self.by_name.setdefault(names.get("name"), inst)
+            self.by_category.setdefault(inst.get("category"), []).append(inst)
+            if inst.get("isCommunityCollege"):
+                self.cc_ids.append(inst.get("id"))
+
+    def _load(self):
+        if self.cache_path and os.path.exists(self.cache_path):
+            if time.time() - os.path.getmtime(self.cache_path) < self.ttl:
+                with open(self.cache_path, encoding="utf-8") as f:
+                    return json.load(f)
+        data = getAPIData("institutions")
+        if self.cache_path:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+        return data
+
+    def idFromName(self, schoolName):
+        inst = self.by_name.get(schoolName)
+        return inst.get("id") if inst else -1
+
+    def nameFromID(self, id):
+        inst = self.by_id.get(id)
+        if not inst:
+            return -1
+        return inst.get("names")[0].get("name")
+
+    def idsInCategory(self, category, communityCollege=None):
+        return [inst.get("id") for inst in self.by_category.get(category, [])
+                if communityCollege is None or bool(inst.get("isCommunityCollege")) == communityCollege]
+
+_registry = None
+
+# shared registry, built the first time any lookup needs it
+def getRegistry():
+    global _registry
+    if _registry is None:
+        _registry = InstitutionRegistry()
+    return _registry
+
 # gets the id for the university or CC given the name from the Assist API. If there is an error in this returns -1
 def getSchoolID(schoolName):
-    # get the dictionary for the institution data
-    data = getAPIData("institutions")
-    # find the instituion in the dictionary and get the id
-    for i in range(len(data)):
-        NamesList = data[i].get("names")
-        for names in NamesList:
-            if schoolName == names.get('name'):
-                return data[i].get('id')
-             
-    return -1
+    return getRegistry().idFromName(schoolName)
 
 # get the name of the institution from the id
 def getSchoolFromID(id):
-    data = getAPIData("institutions")
-    # find the id and then get the institution
-    for i in range(len(data)):
-        if id == data[i].get("id"):
-            NamesList = data[i].get("names")
-            return NamesList[0].get('name')
-             
-    return -1
+    return getRegistry().nameFromID(id)
 
 # get a list of all CC ids
 def getCCIdList():
-    CCids = []
-    # get the dictionary for the institution data
-    data = getAPIData("institutions")
-    # find the instituion in the dictionary and get the id
-    for i in range(len(data)):
-        if data[i].get("isCommunityCollege"):
-            CCids.append(data[i].get("id"))
-    return CCids       
+    return list(getRegistry().cc_ids)
 
 # get the names of all the CCs
 def getCCNameList():
-    CCIds = getCCIdList()
-    CCNames = []
-    for ccid in CCIds:
-        CCNames.append(getSchoolFromID(ccid))
-    return CCNames
+    registry = getRegistry()
+    return [registry.nameFromID(ccid) for ccid in registry.cc_ids]
 
 # For a particular university, get a list of CCs it has 2022 - 2023 agreements with
 def getCCListWithAggreements(UniName):
-    URL = "https://assist.org/api/institutions/" + str(getSchoolID(UniName)) + "/agreements"
-    data = requests.get(URL).json()
+    data = getAPIData("institutions/" + str(getSchoolID(UniName)) + "/agreements")
     CClst = []
     for cc in data:
         if cc["isCommunityCollege"] and 73 in cc["sendingYearIds"] and cc["institutionName"] not in CClst:
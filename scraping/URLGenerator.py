@@ -1,15 +1,19 @@
 import os
-import requests
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlencode
 
 # Adjust these imports to match your actual file/module paths
 # (e.g., if AssistAPIInformationGetter.py is in the same directory, do `from AssistAPIInformationGetter import ...`)
+from assist_client import get_client, configure_client, ASSIST_API
 from AssistAPIInformationGetter import (
-    getAPIData,        # method returning JSON from Assist.org endpoints
     getCCIdList,       # returns all Community College IDs
-    getSchoolFromID    # returns the name of an institution, given its ID
+    getSchoolFromID,   # returns the name of an institution, given its ID
+    getRegistry        # indexed institutions list, loaded once per run
 )
 
+DEFAULT_WORKERS = 8
+
 ############################################################
 # 1) Dictionary of UC IDs and EXACT 'Computer Science' labels
 ############################################################
@@ -33,22 +37,20 @@ def getUCIdList():
     """
     Returns a list of UC institution IDs (category=1, isCommunityCollege=False).
     """
-    data = getAPIData("institutions")
-    uc_ids = []
-    for inst in data:
-        if (inst.get("category") == 1) and (not inst.get("isCommunityCollege")):
-            uc_ids.append(inst["id"])
-    return uc_ids
+    return getRegistry().idsInCategory(1, communityCollege=False)
 
 
 ############################################################
 # 3) find_computer_science_key using EXACT matching
 ############################################################
-def find_computer_science_key(cc_id, uc_id, year=75):
+def find_computer_science_key(cc_id, uc_id, year=75, client=None):
     """
     Fetches the major agreements for CC->UC (major category),
     looks for the EXACT label from `uc_cs_labels[uc_id]`,
     and returns the key if found (or None otherwise).
+
+    Requests go through the shared AssistClient (pooled session,
+    timeouts, retries) unless another client is passed in.
     """
     # 1) If no known label for this UC, skip
     if uc_id not in uc_cs_labels:
@@ -56,15 +58,13 @@ def find_computer_science_key(cc_id, uc_id, year=75):
     desired_label = uc_cs_labels[uc_id]
 
     # 2) Call the agreements endpoint
-    base_api = "https://assist.org/api/agreements"
     params = {
         "receivingInstitutionId": uc_id,
         "sendingInstitutionId": cc_id,
         "academicYearId": year,
         "categoryCode": "major"
     }
-    resp = requests.get(base_api, params=params)
-    data = resp.json()
+    data = (client or get_client()).get_json("agreements", params=params)
 
     # 3) Search for the EXACT label
     for report in data.get("reports", []):
@@ -132,20 +132,104 @@ def generate_cs_urls_for_uc(uc_id, output_dir="cs_urls", year=75):
 
 
 ############################################################
-# 6) Main: Generate for All UCs
+# 6) Parallel discovery: every (CC, UC) lookup in one run
 ############################################################
-def main():
+def discover_cs_keys(uc_ids, cc_ids, year=75, workers=DEFAULT_WORKERS):
     """
-    Example usage: build all Computer Science articulation URLs for each UC,
-    storing them in 'cs_urls/' (one file per UC).
+    Runs find_computer_science_key for every (CC, UC) pair on a bounded
+    thread pool. All workers share the AssistClient's keep-alive pool.
+    Returns ({uc_id: {cc_id: key}}, [(cc_id, uc_id, error)]): pairs without
+    a CS agreement are left out of the keys, lookups that still failed after
+    the client's retries are listed separately.
     """
-    # Identify all UC IDs
+    keys = {uc_id: {} for uc_id in uc_ids}
+    failures = []
+    pairs = [(cc_id, uc_id) for uc_id in uc_ids if uc_id in uc_cs_labels for cc_id in cc_ids]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(find_computer_science_key, cc_id, uc_id, year): (cc_id, uc_id)
+            for cc_id, uc_id in pairs
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            cc_id, uc_id = futures[fut]
+            try:
+                key = fut.result()
+            except Exception as e:
+                print(f"⚠️ CC {cc_id} -> UC {uc_id} failed: {e}")
+                failures.append((cc_id, uc_id, e))
+                continue
+            if key:
+                keys[uc_id][cc_id] = key
+            if done % 100 == 0:
+                print(f"  {done}/{len(pairs)} lookups done")
+    return keys, failures
+
+
+def generate_all_cs_urls(output_dir="cs_urls", year=75, workers=DEFAULT_WORKERS):
+    """
+    Same files as calling generate_cs_urls_for_uc for every UC, but with all
+    lookups fanned out at once. Lines keep the CC order of getCCIdList().
+
+    A UC with any failed lookup keeps its existing file, since writing it
+    would silently drop those CCs. Returns the failed (cc_id, uc_id, error).
+    """
+    os.makedirs(output_dir, exist_ok=True)
     uc_ids = getUCIdList()
+    cc_ids = getCCIdList()
+    keys, failures = discover_cs_keys(uc_ids, cc_ids, year=year, workers=workers)
+    failed_ucs = {uc_id for _, uc_id, _ in failures}
 
     for uc_id in uc_ids:
-        generate_cs_urls_for_uc(uc_id, output_dir="cs_urls", year=75)  # e.g. 2024-2025
+        uc_name = getSchoolFromID(uc_id)
+        if uc_id in failed_ucs:
+            print(f"❌ Not writing {uc_name}: some lookups failed")
+            continue
+        uc_name_sanitized = uc_name.replace(" ", "_").replace(",", "")
+        output_file = os.path.join(output_dir, f"cs_urls_{uc_name_sanitized}.txt")
+        with open(output_file, "w", encoding="utf-8") as f:
+            for cc_id in cc_ids:
+                cs_key = keys[uc_id].get(cc_id)
+                if cs_key:
+                    final_url = build_articulation_url(year, cc_id, uc_id, cs_key)
+                    f.write(f"{getSchoolFromID(cc_id)}\t{final_url}\n")
+        print(f"✅ Wrote {uc_name} Computer Science URLs to {output_file}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} lookups failed:")
+        for cc_id, uc_id, error in failures:
+            print(f"  CC {cc_id} ({getSchoolFromID(cc_id)}) -> UC {uc_id} ({getSchoolFromID(uc_id)}): {error}")
+    return failures
+
 
-    print("Done generating Computer Science URLs for all UCs!")
+############################################################
+# 7) Main: Generate for All UCs
+############################################################
+def main():
+    """
+    Example usage: build all Computer Science articulation URLs for each UC,
+    storing them in 'cs_urls/' (one file per UC).
+    """
+    parser = argparse.ArgumentParser(description="Generate Computer Science articulation URLs for every UC.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="concurrent agreement lookups (1 = the old one-at-a-time loop)")
+    parser.add_argument("--base-api", default=ASSIST_API,
+                        help="assist.org API root, e.g. a local stub server for testing")
+    parser.add_argument("--year", type=int, default=75)  # e.g. 2024-2025
+    args = parser.parse_args()
+    configure_client(base_url=args.base_api, pool_size=max(args.workers, 1))
+
+    if args.workers > 1:
+        failures = generate_all_cs_urls(output_dir="cs_urls", year=args.year, workers=args.workers)
+        if failures:
+            raise SystemExit(f"{len(failures)} lookups failed; their UC files were left unchanged, rerun to retry")
+    else:
+        # Identify all UC IDs
+        uc_ids = getUCIdList()
+
+        for uc_id in uc_ids:
+            generate_cs_urls_for_uc(uc_id, output_dir="cs_urls", year=args.year)
+
+    print(f"Done generating Computer Science URLs for all UCs! ({get_client().summary()})")
 
 
 if __name__ == "__main__":
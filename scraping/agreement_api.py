@@ -0,0 +1,174 @@
+import argparse
+import json
+import logging
+import sys
+from urllib.parse import urlparse, parse_qs
+
+from assist_client import get_client
+
+'''
+Pulls articulation data straight from assist.org's JSON agreement endpoint
+instead of rendering the agreement page in Chrome.
+
+The output has the same shape as scraping.parse_articulations:
+    [{"Receiving": ["MATH 20A"], "Sending": [["MATH 150"], ["MATH 1A", "MATH 1B"]]}, ...]
+where "Sending" is a list of OR options, each option a list of CC courses
+that must all be taken, or ["Not Articulated"].
+
+Parsing is kept separate from fetching so recorded payloads can be checked
+offline:
+    python agreement_api.py --fixture saved_agreement.json
+    python agreement_api.py --fixture fixtures/agreement_de_anza_ucsd.json \
+        --expected fixtures/agreement_de_anza_ucsd.expected.json
+
+fixtures/ holds payloads in the endpoint's format with the records they must
+parse to (exit status 1 on any difference).
+'''
+
+AGREEMENT_ENDPOINT = "articulation/Agreements"
+
+
+def view_by_key(url):
+    """
+    Returns the viewByKey stored in an agreement URL from
+    cc_agreements/*/agreements.txt, e.g. "75/110/to/79/Major/4e69...".
+    """
+    values = parse_qs(urlparse(url).query).get("viewByKey")
+    return values[0] if values else None
+
+
+def fetch_agreement_json(key, client=None):
+    return (client or get_client()).get_json(AGREEMENT_ENDPOINT, params={"Key": key})
+
+
+def course_code(course):
+    prefix = (course.get("prefix") or "").strip()
+    number = (course.get("courseNumber") or "").strip()
+    return f"{prefix} {number}".strip()
+
+
+def receiving_courses(articulation):
+    if articulation.get("type") == "Series" or articulation.get("series"):
+        series = articulation.get("series") or {}
+        return [course_code(c) for c in series.get("courses", [])]
+    course = articulation.get("course")
+    return [course_code(course)] if course else []
+
+
+def _group_options(group):
+    """
+    One sending course group → list of OR options.
+    An "Or" group gives one option per item, an "And" group a single option.
+    """
+    codes = []
+    for item in group.get("items", []):
+        if item.get("type") == "Series" or "courses" in item:
+            codes.append([course_code(c) for c in item.get("courses", [])])
+        else:
+            codes.append([course_code(item)])
+    if group.get("courseConjunction") == "Or":
+        return codes
+    return [[c for option in codes for c in option]]
+
+
+def sending_courses(articulation):
+    sending = articulation.get("sendingArticulation") or {}
+    groups = sorted(sending.get("items") or [], key=lambda g: g.get("position", 0))
+    if sending.get("noArticulationReason") or not groups:
+        return ["Not Articulated"]
+
+    # groups are OR'd together unless a conjunction range says "And"; the
+    # range is in group positions, which need not start at 0 or be contiguous
+    and_with_next = set()
+    for conj in sending.get("courseGroupConjunctions") or []:
+        if conj.get("groupConjunction") == "And":
+            begin = conj.get("sendingCourseGroupBeginPosition", 0)
+            end = conj.get("sendingCourseGroupEndPosition", begin)
+            and_with_next.update(range(begin, end))
+
+    options = []
+    pending = None
+    for index, group in enumerate(groups):
+        pos = group.get("position", index)
+        group_opts = _group_options(group)
+        if pending is not None:
+            # AND of two groups: every pairing of their options
+            group_opts = [a + b for a in pending for b in group_opts]
+        if pos in and_with_next:
+            pending = group_opts
+        else:
+            options.extend(group_opts)
+            pending = None
+    if pending:
+        options.extend(pending)
+
+    options = [o for o in options if o]
+    return options or ["Not Articulated"]
+
+
+def _articulation_list(payload):
+    result = payload.get("result", payload)
+    arts = result.get("articulations", [])
+    # the endpoint ships the articulations as a JSON string inside the JSON
+    if isinstance(arts, str):
+        arts = json.loads(arts)
+    return arts
+
+
+def parse_agreement_json(payload):
+    out = []
+    for entry in _articulation_list(payload):
+        articulation = entry.get("articulation", entry)
+        recv = receiving_courses(articulation)
+        if not recv:
+            continue
+        out.append({"Receiving": recv, "Sending": sending_courses(articulation)})
+    if not out:
+        logging.warning("No articulations found in agreement JSON")
+    return out
+
+
+def fetch_articulations_json(url, client=None):
+    key = view_by_key(url)
+    if not key:
+        raise ValueError(f"No viewByKey in {url}")
+    return parse_agreement_json(fetch_agreement_json(key, client=client))
+
+
+def check_fixture(records, expected):
+    """
+    Differences between parsed `records` and `expected`, one line each.
+    """
+    problems = []
+    if len(records) != len(expected):
+        problems.append(f"{len(records)} records parsed, {len(expected)} expected")
+    for got, want in zip(records, expected):
+        if got != want:
+            problems.append(f"{'; '.join(want['Receiving'])}: got {got}, expected {want}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a saved agreement JSON payload offline.")
+    parser.add_argument("--fixture", required=True, help="saved agreement endpoint response")
+    parser.add_argument("--expected", help="JSON list of the records the fixture must parse to")
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        records = parse_agreement_json(json.load(f))
+    if not args.expected:
+        for rec in records:
+            print(f"{'; '.join(rec['Receiving'])}  <=  {rec['Sending']}")
+        return
+
+    with open(args.expected, encoding="utf-8") as f:
+        problems = check_fixture(records, json.load(f))
+    for line in problems:
+        print(f"✗ {line}")
+    if problems:
+        sys.exit(1)
+    print(f"✅ {len(records)} records match {args.expected}")
+
+
+if __name__ == "__main__":
+    main()
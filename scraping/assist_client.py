@@ -0,0 +1,163 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+'''
+One HTTP client for every assist.org API call.
+
+    client = get_client()
+    data = client.get_json("institutions")
+    data = client.get_json("agreements", params={...})
+
+The client keeps a pooled keep-alive session, applies a timeout to every
+request, retries connection errors and 5xx responses with jittered
+exponential backoff, waits out 429 responses (honouring Retry-After), and
+raises AssistAPIError instead of a bare JSONDecodeError when assist.org
+answers with an HTML error page.
+'''
+
+ASSIST_API = "https://assist.org/api/"
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 1.0
+DEFAULT_POOL_SIZE = 16
+MAX_RETRY_AFTER = 300
+
+
+class AssistAPIError(Exception):
+    def __init__(self, message, status=None, url=None):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+
+def _retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AssistClient:
+    def __init__(self, base_url=ASSIST_API, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, pool_size=DEFAULT_POOL_SIZE):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "latency": 0.0}
+
+    def url_for(self, endpoint):
+        if endpoint.startswith("http://") or endpoint.startswith("https://"):
+            return endpoint
+        return self.base_url + endpoint.lstrip("/")
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _sleep_before_retry(self, attempt, retry_after=None):
+        if retry_after is not None:
+            delay = min(retry_after, MAX_RETRY_AFTER)
+        else:
+            delay = self.backoff * (2 ** attempt)
+        # jitter keeps concurrent workers from retrying in lockstep
+        time.sleep(delay + random.uniform(0, self.backoff))
+
+    def get(self, endpoint, params=None):
+        """
+        GET with retries. Returns the final requests.Response (2xx only).
+        """
+        url = self.url_for(endpoint)
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            start = time.monotonic()
+            try:
+                resp = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                self._count("requests")
+                self._count("latency", time.monotonic() - start)
+                if last:
+                    self._count("errors")
+                    raise AssistAPIError(f"GET {url} failed: {e}", url=url) from e
+                logging.warning(f"GET {url} failed ({e}), retrying")
+                self._count("retries")
+                self._sleep_before_retry(attempt)
+                continue
+            self._count("requests")
+            self._count("latency", time.monotonic() - start)
+
+            if resp.status_code == 429:
+                self._count("throttled")
+                if not last:
+                    wait = _retry_after_seconds(resp.headers.get("Retry-After"))
+                    logging.warning(f"Throttled by {url}, waiting {wait if wait is not None else 'backoff'}")
+                    self._count("retries")
+                    self._sleep_before_retry(attempt, retry_after=wait)
+                    continue
+            elif resp.status_code >= 500 and not last:
+                self._count("retries")
+                self._sleep_before_retry(attempt)
+                continue
+
+            if resp.status_code >= 400:
+                self._count("errors")
+                raise AssistAPIError(f"GET {resp.url} returned {resp.status_code}",
+                                     status=resp.status_code, url=resp.url)
+            return resp
+
+    def get_json(self, endpoint, params=None):
+        resp = self.get(endpoint, params=params)
+        try:
+            return resp.json()
+        except ValueError as e:
+            self._count("errors")
+            snippet = resp.text[:200].replace("\n", " ")
+            raise AssistAPIError(f"GET {resp.url} did not return JSON: {snippet!r}",
+                                 status=resp.status_code, url=resp.url) from e
+
+    def summary(self):
+        with self._lock:
+            s = dict(self.stats)
+        avg = s["latency"] / s["requests"] if s["requests"] else 0.0
+        return (f"{s['requests']} requests, avg {avg * 1000:.0f} ms, {s['retries']} retries, "
+                f"{s['throttled']} throttled, {s['errors']} errors")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AssistClient()
+        return _client
+
+
+def configure_client(**kwargs):
+    """
+    Replace the shared client, e.g. configure_client(base_url="http://127.0.0.1:8000/api/")
+    to point every call at a local stub server.
+    """
+    global _client
+    with _client_lock:
+        _client = AssistClient(**kwargs)
+        return _client
@@ -0,0 +1,160 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.chrome.options import Options
+
+'''
+A small pool of long-lived headless Chrome instances.
+
+Starting Chrome (and resolving chromedriver through ChromeDriverManager) costs
+far more than loading one agreement page, so instead of one browser per URL we
+keep a few drivers alive and hand them out to whoever is scraping.
+
+    pool = DriverPool(size=2, max_pages=50)
+    with pool.driver() as driver:
+        driver.get(url)
+    pool.close()
+'''
+
+# how many browsers to keep around and how many pages each one serves
+# before it is thrown away and replaced with a fresh one
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES = 50
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _chromedriver_path():
+    # ChromeDriverManager().install() hits the network, only do it once
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def new_driver():
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--log-level=3")
+    return webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+
+
+def is_healthy(driver):
+    """
+    Returns True if the browser session still answers commands.
+    """
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Hands out headless Chrome drivers to workers.
+
+    A driver is recycled (quit and replaced) once it has served `max_pages`
+    pages, when it fails the health check on checkout, or when the caller's
+    block raises while it was checked out.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES):
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        # drivers are started lazily, so a pool that never gets used never
+        # starts a browser
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _quit(self, pooled):
+        if pooled is None:
+            return
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting pooled driver: {e}")
+
+    def _acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        pooled = self._idle.get(timeout=timeout)
+        if pooled is not None and (pooled.pages >= self.max_pages or not is_healthy(pooled.driver)):
+            logging.info(f"Recycling driver after {pooled.pages} pages")
+            self._quit(pooled)
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = _PooledDriver(new_driver())
+            except Exception:
+                # give the slot back so the pool does not shrink
+                self._idle.put(None)
+                raise
+            with self._lock:
+                self._created += 1
+        return pooled
+
+    def _release(self, pooled, broken=False):
+        if broken or self._closed:
+            self._quit(pooled)
+            pooled = None
+        self._idle.put(pooled)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Check a driver out of the pool for the duration of the `with` block.
+        Each checkout counts as one page towards `max_pages`.
+        """
+        pooled = self._acquire(timeout=timeout)
+        pooled.pages += 1
+        try:
+            yield pooled.driver
+        except Exception:
+            # the page load or the wait blew up, don't trust this browser again
+            self._release(pooled, broken=True)
+            raise
+        else:
+            self._release(pooled)
+
+    @property
+    def drivers_started(self):
+        return self._created
+
+    def close(self):
+        """
+        Quit every idle driver. Drivers that are checked out are quit when
+        they are returned.
+        """
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(pooled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
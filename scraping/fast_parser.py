@@ -0,0 +1,193 @@
+import glob
+import gzip
+import os
+import sys
+import time
+
+import lxml.html
+
+'''
+lxml version of scraping.parse_articulations_bs4.
+
+Produces exactly the same {"Receiving", "Sending"} records, but walks each
+.rowSending subtree once instead of re-searching it for every courseLine
+(the BeautifulSoup version calls find_parent per courseLine and builds a
+full soup with the pure-Python html.parser).
+
+Benchmark against the BeautifulSoup parser on saved pages:
+    python fast_parser.py page1.html page2.html ...
+    python fast_parser.py .cache/scraper        # every cached agreement page
+'''
+
+
+def _has_class(el, name):
+    cls = el.get("class")
+    return bool(cls) and name in cls.split()
+
+
+def _is_div(el, name):
+    return el.tag == "div" and _has_class(el, name)
+
+
+def _text(el):
+    # same as BeautifulSoup's get_text(strip=True)
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _find(el, name):
+    for sub in el.iterdescendants("div"):
+        if _has_class(sub, name):
+            return sub
+    return None
+
+
+def _code_of(course_line):
+    return _text(_find(course_line, "prefixCourseNumber"))
+
+
+def _followed_by_standalone(el):
+    for sib in el.itersiblings():
+        if sib.tag == "awc-view-conjunction" and _has_class(sib, "standAlone"):
+            return True
+    return False
+
+
+def _select_one(el, name):
+    for sub in el.iterdescendants():
+        if isinstance(sub.tag, str) and _has_class(sub, name):
+            return sub
+    return None
+
+
+def extract_receiving_courses(row):
+    wrapper = _find(row, "bracketWrapper")
+    if wrapper is not None:
+        content = _find(wrapper, "bracketContent")
+        return [_code_of(cl) for cl in content.iterdescendants("div") if _has_class(cl, "courseLine")]
+    for cl in row.iterdescendants():
+        if isinstance(cl.tag, str) and _has_class(cl, "courseLine"):
+            single = _select_one(cl, "prefixCourseNumber")
+            if single is not None:
+                return [_text(single)]
+    return []
+
+
+def extract_sending_courses(row):
+    # "Not Articulated"
+    if row.find(".//p") is not None and "No Course Articulated" in "".join(row.itertext()):
+        return ["Not Articulated"]
+
+    # courseLines inside a bracketWrapper belong to that bracket's AND list;
+    # an ancestor above the row can also be a bracketWrapper
+    outer_bracket = any(_is_div(a, "bracketWrapper") for a in row.iterancestors())
+
+    brackets = []        # [(bracket element, [codes])] in document order
+    standalone = []      # courseLines not under any bracketWrapper
+    open_brackets = []   # bracketWrappers enclosing the current element
+
+    # single pre-order walk over the subtree
+    for el in row.iterdescendants():
+        if not isinstance(el.tag, str):
+            continue
+        while open_brackets and not _is_ancestor(open_brackets[-1][0], el):
+            open_brackets.pop()
+        if _is_div(el, "bracketWrapper"):
+            entry = (el, [])
+            brackets.append(entry)
+            open_brackets.append(entry)
+        elif _is_div(el, "courseLine"):
+            if open_brackets:
+                code = _code_of(el)
+                for _, codes in open_brackets:
+                    codes.append(code)
+            elif not outer_bracket:
+                standalone.append(el)
+
+    groups = []
+    current = []
+
+    # AND‑groups
+    for br, and_list in brackets:
+        current.append(and_list)
+        if _followed_by_standalone(br):
+            groups.append(current); current = []
+
+    # standalone courseLines
+    for cl in standalone:
+        current.append([_code_of(cl)])
+        if _followed_by_standalone(cl):
+            groups.append(current); current = []
+
+    if current:
+        groups.append(current)
+
+    # flatten if single OR‑group
+    return groups[0] if len(groups)==1 else groups
+
+
+def _is_ancestor(anc, el):
+    parent = el.getparent()
+    while parent is not None:
+        if parent is anc:
+            return True
+        parent = parent.getparent()
+    return False
+
+
+def parse_articulations(html):
+    root = lxml.html.fromstring(html)
+    out = []
+    for row in root.iter("div"):
+        if not _has_class(row, "articRow"):
+            continue
+        recv = extract_receiving_courses(_select_one(row, "rowReceiving"))
+        send = extract_sending_courses(_select_one(row, "rowSending"))
+        out.append({"Receiving": recv, "Sending": send})
+    return out
+
+
+def _saved_pages(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            # a response cache directory: only rendered pages, not JSON payloads
+            for blob in sorted(glob.glob(os.path.join(path, "blobs", "*.gz"))):
+                with gzip.open(blob, "rb") as f:
+                    data = f.read().decode("utf-8")
+                if "articRow" in data:
+                    yield blob, data
+        else:
+            with open(path, encoding="utf-8") as f:
+                yield path, f.read()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python fast_parser.py <page.html | cache dir> ...")
+        sys.exit(1)
+
+    import scraping  # BeautifulSoup parser to compare against
+
+    pages = list(_saved_pages(sys.argv[1:]))
+    bs_time = lxml_time = 0.0
+    mismatches = 0
+    for name, html in pages:
+        start = time.perf_counter()
+        expected = scraping.parse_articulations_bs4(html)
+        bs_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = parse_articulations(html)
+        lxml_time += time.perf_counter() - start
+
+        if got != expected:
+            mismatches += 1
+            print(f"❌ output differs: {name}")
+
+    print(f"{len(pages)} pages, {mismatches} mismatches")
+    print(f"BeautifulSoup: {bs_time:.3f}s   lxml: {lxml_time:.3f}s")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
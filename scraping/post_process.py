@@ -3,11 +3,17 @@
 Iterate over every *_allUC.csv in results/ and create a single filtered
 CSV per CC under filtered_results/.
 
-Usage:  python post_process.py          # no args needed
+Usage:  python post_process.py            # no args needed
+        python post_process.py --jobs 0   # one worker process per core
+        python post_process.py --compare  # indexed vs. old substring matcher
 """
 
 import os
+import re
 import csv
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 from files.course_reqs import UC_REQUIREMENTS
 
@@ -30,11 +36,82 @@ RESULTS_DIR = os.path.join(BASE_DIR, "..", "results")
 FILTERED_DIR = os.path.join(BASE_DIR, "..", "filtered_results")
 
 # ------------------------------------------------------------------
+_TOKEN_RE = re.compile(r"[A-Z0-9&]+")
+
+
+def course_tokens(text: str):
+    """
+    Normalized course-code tokens: "math 1a; Math 1B" → ("MATH", "1A", "MATH", "1B").
+    """
+    return tuple(_TOKEN_RE.findall(text.upper()))
+
+
+class RequirementMatcher:
+    """
+    Precompiled index over UC_REQUIREMENTS.
+
+    For every UC, each requirement's course code is turned into a token
+    tuple and stored in a dict, so matching a receiving string is one
+    pass over its tokens with a hash lookup per (position, code length).
+    Codes only match on whole tokens: "MATH 1A" does not match inside
+    "MATH 1AB".
+    """
+
+    def __init__(self, requirements=UC_REQUIREMENTS):
+        self.index = {}     # uc → {token tuple: [(order, (group_id, set_id, num_required))]}
+        self.lengths = {}   # uc → sorted distinct token-tuple lengths
+        for uc_abbr, reqs in requirements.items():
+            index = {}
+            order = 0
+            for group_id, entries in reqs.items():
+                if not isinstance(entries[0], list):
+                    entries = [entries]  # normalize single entry
+                for course_code, set_id, num_required in entries:
+                    index.setdefault(course_tokens(course_code), []).append(
+                        (order, (group_id, set_id, num_required))
+                    )
+                    order += 1
+            self.index[uc_abbr] = index
+            self.lengths[uc_abbr] = sorted({len(k) for k in index})
+
+    def match(self, uc_abbr: str, receiving_course: str):
+        index = self.index.get(uc_abbr)
+        if not index:
+            return []
+        tokens = course_tokens(receiving_course)
+        found = {}
+        for start in range(len(tokens)):
+            for length in self.lengths[uc_abbr]:
+                hits = index.get(tokens[start:start + length])
+                if hits:
+                    for order, match in hits:
+                        found[order] = match
+        # same order as UC_REQUIREMENTS, like match_requirement
+        return [found[order] for order in sorted(found)]
+
+
+_matcher = None
+
+
+def get_matcher():
+    global _matcher
+    if _matcher is None:
+        _matcher = RequirementMatcher()
+    return _matcher
+
+
 def match_requirement(uc_abbr: str, receiving_course: str):
     """
     Return a list of (group_id, set_id, num_required) tuples from
     UC_REQUIREMENTS that match the given receiving‑course string.
     """
+    return get_matcher().match(uc_abbr, receiving_course)
+
+
+def match_requirement_substring(uc_abbr: str, receiving_course: str):
+    """
+    Original case-insensitive substring matcher, kept for --compare.
+    """
     matches = []
     reqs = UC_REQUIREMENTS.get(uc_abbr, {})
     for group_id, entries in reqs.items():
@@ -50,6 +127,16 @@ def process_csv(csv_path):
     """
     Read one *_allUC.csv file and return a list of matched-row dicts.
     """
+    cc, matched_rows, total, matched_total = scan_csv(csv_path)
+    print(f"📄 {cc}: scanned {total:>4} → matched {matched_total:>3}")
+    return cc, matched_rows
+
+
+def scan_csv(csv_path):
+    """
+    process_csv without the printing: (cc, matched rows, rows scanned,
+    rows matched).
+    """
     matched_rows = []
     total, matched_total = 0, 0
 
@@ -89,16 +176,16 @@ def process_csv(csv_path):
                 )
 
     cc = os.path.basename(csv_path).replace("_allUC.csv", "")
-    print(f"📄 {cc}: scanned {total:>4} → matched {matched_total:>3}")
-    return cc, matched_rows
+    return cc, matched_rows, total, matched_total
 
 
-def save_filtered_csv(cc_name, rows):
+def save_filtered_csv(cc_name, rows, verbose=True):
     """
     Write filtered_<CC>.csv into filtered_results/.
     """
     if not rows:
-        print(f"⚠️  {cc_name}: no matched rows, skipping file.")
+        if verbose:
+            print(f"⚠️  {cc_name}: no matched rows, skipping file.")
         return
 
     os.makedirs(FILTERED_DIR, exist_ok=True)
@@ -126,17 +213,80 @@ def save_filtered_csv(cc_name, rows):
                 out[f"Courses Group {i+1}"] = val
             writer.writerow(out)
 
-    print(f"✅  Saved → {out_path}")
+    if verbose:
+        print(f"✅  Saved → {out_path}")
+    return out_path
+
+
+def filter_one(csv_path):
+    """
+    Worker for the process pool: filter one CC and write its file.
+    Printing is left to the parent so output does not interleave.
+    """
+    cc, rows, total, matched_total = scan_csv(csv_path)
+    out_path = save_filtered_csv(cc, rows, verbose=False)
+    return {"cc": cc, "scanned": total, "matched": matched_total, "rows": len(rows), "out_path": out_path}
+
+
+def run_parallel(csv_files, jobs):
+    """
+    Filter every CC on `jobs` processes and print one combined summary.
+    Each CC still writes its own file, so the output matches the serial run.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        summaries = list(pool.map(filter_one, csv_files, chunksize=4))
+
+    for s in sorted(summaries, key=lambda s: s["cc"]):
+        print(f"📄 {s['cc']}: scanned {s['scanned']:>4} → matched {s['matched']:>3}")
+        if not s["out_path"]:
+            print(f"⚠️  {s['cc']}: no matched rows, skipping file.")
+
+    scanned = sum(s["scanned"] for s in summaries)
+    matched = sum(s["matched"] for s in summaries)
+    written = sum(1 for s in summaries if s["out_path"])
+    print(f"\n✅  {len(summaries)} CCs on {jobs} processes: scanned {scanned} → matched {matched}, "
+          f"{written} files written to {FILTERED_DIR}")
+
+
+def compare_matchers(csv_files):
+    """
+    Run the indexed and the substring matcher over every receiving string in
+    results/ and print where they disagree. Exit status 1 if they do.
+    """
+    differences = 0
+    seen = set()
+    for csv_path in csv_files:
+        with open(csv_path, newline='', encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                uc_abbr = UC_ABBREVIATIONS.get(row["UC Campus"].strip())
+                receiving = row["UC Course Requirement"].strip()
+                if not uc_abbr or not receiving or (uc_abbr, receiving) in seen:
+                    continue
+                seen.add((uc_abbr, receiving))
+                new = match_requirement(uc_abbr, receiving)
+                old = match_requirement_substring(uc_abbr, receiving)
+                if new != old:
+                    differences += 1
+                    print(f"≠ {uc_abbr} {receiving!r}: substring={old} indexed={new}")
+    print(f"{len(seen)} distinct (UC, receiving) pairs, {differences} differ")
+    return differences == 0
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Filter results/*_allUC.csv down to UC_REQUIREMENTS.")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare the indexed matcher against the old substring matcher")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes (0 = one per core, 1 = serial)")
+    args = parser.parse_args()
+
     if not os.path.isdir(RESULTS_DIR):
         print(f"❌ No 'results/' directory found at expected path: {RESULTS_DIR}")
         return
 
     csv_files = [
         os.path.join(RESULTS_DIR, f)
-        for f in os.listdir(RESULTS_DIR)
+        for f in sorted(os.listdir(RESULTS_DIR))
         if f.endswith("_allUC.csv")
     ]
 
@@ -144,6 +294,14 @@ def main():
         print("❌ No *_allUC.csv files found in 'results/'.")
         return
 
+    if args.compare:
+        sys.exit(0 if compare_matchers(csv_files) else 1)
+
+    jobs = args.jobs or os.cpu_count()
+    if jobs > 1:
+        run_parallel(csv_files, jobs)
+        return
+
     for csv_path in csv_files:
         cc_name, rows = process_csv(csv_path)
         save_filtered_csv(cc_name, rows)
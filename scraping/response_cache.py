@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+'''
+On-disk cache for agreement responses (JSON payloads and rendered HTML).
+
+Layout under CACHE_DIR:
+    blobs/<sha256 of payload>.gz   compressed payload, shared by identical responses
+    keys/<sha256 of key>.json      {"key", "blob", "size", "fetched_at"}
+
+Modes:
+    default     use a cached entry younger than the TTL, otherwise fetch
+    refresh     always fetch and overwrite the entry
+    offline     never fetch; a missing entry raises CacheMiss
+    revalidate  always fetch, but keep the old blob when the payload is
+                unchanged and count how many entries actually changed
+'''
+
+CACHE_DIR = os.path.join(".cache", "scraper")
+DEFAULT_TTL = 30 * 24 * 3600            # agreements for a year rarely change
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+CACHE_MODES = ("default", "refresh", "offline", "revalidate")
+
+
+class CacheMiss(KeyError):
+    pass
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=CACHE_DIR, mode="default", ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {CACHE_MODES}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.key_dir = os.path.join(cache_dir, "keys")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.key_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "fetches": 0, "changed": 0, "unchanged": 0, "evicted": 0}
+
+    # -- paths ------------------------------------------------------------
+    def _key_path(self, key):
+        return os.path.join(self.key_dir, _sha(key.encode("utf-8")) + ".json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest + ".gz")
+
+    # -- reading / writing ------------------------------------------------
+    def _entry(self, key):
+        try:
+            with open(self._key_path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_blob(self, digest):
+        path = self._blob_path(digest)
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)  # eviction is least-recently-used
+        return data
+
+    def _atomic_write(self, path, data, mode="wb"):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key, max_age=None):
+        """
+        Cached payload bytes for `key`, or None. Entries older than
+        `max_age` seconds count as missing.
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry["fetched_at"] > max_age:
+            return None
+        try:
+            return self._read_blob(entry["blob"])
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        digest = _sha(data)
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            self._atomic_write(blob_path, gzip.compress(data))
+        entry = {"key": key, "blob": digest, "size": len(data), "fetched_at": time.time()}
+        self._atomic_write(self._key_path(key), json.dumps(entry).encode("utf-8"))
+        self._evict()
+        return digest
+
+    def get_or_fetch(self, key, fetch):
+        """
+        `fetch()` must return the payload as bytes.
+        """
+        if self.mode in ("default", "offline"):
+            max_age = self.ttl if self.mode == "default" else None
+            data = self.get(key, max_age=max_age)
+            if data is not None:
+                self._count("hits")
+                return data
+            self._count("misses")
+            if self.mode == "offline":
+                raise CacheMiss(key)
+
+        old = self._entry(key) if self.mode == "revalidate" else None
+        data = fetch()
+        self._count("fetches")
+        digest = self.put(key, data)
+        if old is not None:
+            self._count("unchanged" if old["blob"] == digest else "changed")
+        return data
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # -- eviction ---------------------------------------------------------
+    def _evict(self):
+        if not self.max_bytes:
+            return
+        with self._lock:
+            blobs = []
+            total = 0
+            for name in os.listdir(self.blob_dir):
+                path = os.path.join(self.blob_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                blobs.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(blobs):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self.stats["evicted"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        # key entries pointing at a removed blob are treated as misses by get()
+
+    def log_stats(self):
+        msg = ", ".join(f"{k} {v}" for k, v in self.stats.items())
+        logging.info(f"Response cache ({self.mode}): {msg}")
+        print(f"🗄️  cache ({self.mode}): {msg}")
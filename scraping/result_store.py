@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+'''
+Crash-safe, per-(CC, UC) storage of scraped articulations.
+
+Each finished (CC, UC) pair is written straight away to
+    results/.parts/<CC>/<UC>.json
+and recorded in results/.parts/manifest.json. Every file is written to a
+temp file and renamed into place, so a crash never leaves half a file
+behind. With --resume, pairs already in the manifest are loaded from disk
+instead of being scraped again; the final results/<CC>_allUC.csv is then
+assembled from the parts. A run without --resume calls clear_cc() first, so
+its CSV only holds pairs saved by that run.
+'''
+
+
+@contextmanager
+def atomic_open(path, mode="w", **kwargs):
+    """
+    open() that writes to `path.tmp` and renames it over `path` only if
+    the block finishes without raising.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _safe(name):
+    return name.replace(" ", "_").replace("/", "-")
+
+
+class ResultStore:
+    def __init__(self, results_dir="results"):
+        self.parts_dir = os.path.join(results_dir, ".parts")
+        self.manifest_path = os.path.join(self.parts_dir, "manifest.json")
+        os.makedirs(self.parts_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _part_path(self, cc_name, uc_name):
+        return os.path.join(self.parts_dir, _safe(cc_name), f"{_safe(uc_name)}.json")
+
+    def is_done(self, cc_name, uc_name):
+        with self._lock:
+            done = uc_name in self.manifest.get(cc_name, {})
+        return done and os.path.exists(self._part_path(cc_name, uc_name))
+
+    def _write_manifest(self):
+        with atomic_open(self.manifest_path, encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+
+    def clear_cc(self, cc_name):
+        """
+        Forget every saved UC of `cc_name` (parts and manifest entries).
+        """
+        with self._lock:
+            ucs = self.manifest.pop(cc_name, {})
+            for uc_name in ucs:
+                path = self._part_path(cc_name, uc_name)
+                if os.path.exists(path):
+                    os.remove(path)
+            if ucs:
+                self._write_manifest()
+
+    def save_pair(self, cc_name, uc_name, articulations):
+        """
+        Persist one (CC, UC) result and mark it done in the manifest.
+        """
+        path = self._part_path(cc_name, uc_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_open(path, encoding="utf-8") as f:
+            json.dump(articulations, f)
+        with self._lock:
+            self.manifest.setdefault(cc_name, {})[uc_name] = {
+                "rows": len(articulations),
+                "finished_at": time.time(),
+            }
+            self._write_manifest()
+
+    def load_pair(self, cc_name, uc_name):
+        with open(self._part_path(cc_name, uc_name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_cc(self, cc_name, uc_names):
+        """
+        [(uc_name, articulations)] for every finished UC, in `uc_names` order.
+        """
+        return [(uc, self.load_pair(cc_name, uc)) for uc in uc_names if self.is_done(cc_name, uc)]
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+'''
+Runs (CC, UC) fetch jobs concurrently while staying polite to assist.org.
+
+Every network request a job makes waits on a RateLimiter first. The limiter
+enforces two things at once:
+  - a per-host minimum gap between request starts
+  - a global budget of at most `max_per_minute` requests in any 60 seconds
+
+As soon as the last UC job of a CC finishes, the CC's rows are handed to
+`on_cc_done` so its results CSV can be written without waiting for the rest
+of the run.
+'''
+
+DEFAULT_WORKERS = 4
+DEFAULT_HOST_INTERVAL = 1.0   # seconds between requests to the same host
+DEFAULT_MAX_PER_MINUTE = 60   # global politeness budget
+
+
+class RateLimiter:
+    def __init__(self, host_interval=DEFAULT_HOST_INTERVAL, max_per_minute=DEFAULT_MAX_PER_MINUTE):
+        self.host_interval = host_interval
+        self.max_per_minute = max_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = defaultdict(float)  # host -> earliest next start
+        self._recent = deque()                # start times inside the last minute
+
+    def _reserve(self, host):
+        """
+        Reserve the next start time for `host` and return how long the
+        caller has to sleep before it may go.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot[host])
+
+            if self.max_per_minute:
+                while self._recent and self._recent[0] <= start - 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.max_per_minute:
+                    # wait until the oldest request in the window ages out
+                    start = max(start, self._recent[-self.max_per_minute] + 60)
+                self._recent.append(start)
+
+            self._next_slot[host] = start + self.host_interval
+            return start - now
+
+    def wait(self, url):
+        delay = self._reserve(urlparse(url).netloc)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ScrapeScheduler:
+    """
+    `fetch(uc_name, url, limiter)` must return a list of articulation records
+    (or None on failure) and call `limiter.wait(url)` before every network
+    request it makes, retries included. `on_job_done(cc_name, uc_name,
+    records)`, if given, is called as each job finishes. `on_cc_done(cc_name,
+    results)` receives a list of (uc_name, records) in the same UC order the
+    jobs were submitted in. Both callbacks run on the calling thread.
+    """
+
+    def __init__(self, fetch, on_cc_done, workers=DEFAULT_WORKERS, limiter=None, on_job_done=None):
+        self.fetch = fetch
+        self.on_cc_done = on_cc_done
+        self.on_job_done = on_job_done
+        self.workers = workers
+        self.limiter = limiter or RateLimiter()
+
+    def run(self, cc_jobs):
+        """
+        cc_jobs: {cc_name: [(uc_name, url), ...]}
+        """
+        remaining = {}
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+            for cc_name, uc_urls in cc_jobs.items():
+                remaining[cc_name] = len(uc_urls)
+                results[cc_name] = [None] * len(uc_urls)
+                for idx, (uc_name, url) in enumerate(uc_urls):
+                    fut = executor.submit(self.fetch, uc_name, url, self.limiter)
+                    futures[fut] = (cc_name, idx, uc_name)
+
+            for fut in as_completed(futures):
+                cc_name, idx, uc_name = futures[fut]
+                try:
+                    records = fut.result()
+                except Exception as e:
+                    logging.error(f"Job failed for {cc_name} / {uc_name}: {e}")
+                    records = None
+                if self.on_job_done:
+                    self.on_job_done(cc_name, uc_name, records)
+                results[cc_name][idx] = (uc_name, records)
+                remaining[cc_name] -= 1
+                if remaining[cc_name] == 0:
+                    self.on_cc_done(cc_name, results.pop(cc_name))
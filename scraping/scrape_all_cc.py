@@ -1,8 +1,12 @@
 import os
 import csv
 import time
+import argparse
 import traceback
 import scraping  # Importing existing scraping functions
+from result_store import ResultStore, atomic_open
+from response_cache import CacheMiss, CACHE_MODES, DEFAULT_TTL
+from scheduler import ScrapeScheduler, RateLimiter, DEFAULT_WORKERS, DEFAULT_HOST_INTERVAL, DEFAULT_MAX_PER_MINUTE
 
 # Directories
 AGREEMENTS_DIR = "cc_agreements"
@@ -29,12 +33,14 @@ def find_agreement_urls(cc_name):
                     urls.append((uc_name, url))
     return urls
 
-def scrape_uc_data(uc_name, url):
+def scrape_uc_data(uc_name, url, limiter=None):
     print(f"🔍 Scraping {uc_name} => {url}")
     for attempt in range(3):
         try:
-            html = scraping.get_dynamic_html(url)
-            return scraping.parse_articulations(html)
+            return scraping.fetch_articulations(url, limiter=limiter)
+        except CacheMiss:
+            print(f"❌ {uc_name} is not cached (offline mode)")
+            return None
         except Exception as e:
             print(f"❌ Error scraping {uc_name} (Attempt {attempt+1}/3): {e}")
             traceback.print_exc()
@@ -61,7 +67,7 @@ def write_csv(cc_name, all_rows):
     for i in range(1, max_or_columns + 1):
         headers.append(f"Courses Group {i}")
 
-    with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+    with atomic_open(csv_path, encoding="utf-8", newline="") as csv_file:
         writer = csv.DictWriter(csv_file, fieldnames=headers)
         writer.writeheader()
         for row in all_rows:
@@ -73,43 +79,105 @@ def write_csv(cc_name, all_rows):
 
     print(f"✅ CSV saved: {csv_path}")
 
-def process_all_ccs():
+def build_rows(cc_name, uc_results):
+    all_rows = []
+    for uc_name, articulations in uc_results:
+        if not articulations:
+            continue
+
+        for record in articulations:
+            receiving = record["Receiving"]
+            sending = record["Sending"]
+
+            row_dict = {
+                "UC Campus": uc_name,
+                "CC": cc_name,
+                "UC Course Requirement": "; ".join(receiving),
+                "OR Groups": process_sending_courses(sending)
+            }
+
+            all_rows.append(row_dict)
+    return all_rows
+
+def finish_cc(cc_name, uc_results):
+    all_rows = build_rows(cc_name, uc_results)
+    if all_rows:
+        write_csv(cc_name, all_rows)
+    else:
+        print(f"⚠️ No data extracted for {cc_name}.")
+
+def process_all_ccs(workers=DEFAULT_WORKERS, host_interval=DEFAULT_HOST_INTERVAL,
+                    max_per_minute=DEFAULT_MAX_PER_MINUTE, resume=False):
     cc_folders = [f for f in os.listdir(AGREEMENTS_DIR) if os.path.isdir(os.path.join(AGREEMENTS_DIR, f))]
+    store = ResultStore(RESULTS_DIR)
+
+    cc_ucs = {}
+    cc_jobs = {}
     for folder in cc_folders:
         cc_name = folder.replace("_", " ").replace("-", "/")
-        print(f"\n📘 Processing: {cc_name}")
-
         uc_urls = find_agreement_urls(cc_name)
         if not uc_urls:
             print(f"⚠️ Skipping {cc_name} due to missing URLs.")
             continue
-
-        all_rows = []
-        for uc_name, url in uc_urls:
-            articulations = scrape_uc_data(uc_name, url)
-            if not articulations:
+        cc_ucs[cc_name] = [uc for uc, _ in uc_urls]
+        if resume:
+            uc_urls = [(uc, url) for uc, url in uc_urls if not store.is_done(cc_name, uc)]
+            if not uc_urls:
+                # everything already scraped, only the CSV may be missing
+                finish_cc(cc_name, store.load_cc(cc_name, cc_ucs[cc_name]))
                 continue
-
-            for record in articulations:
-                receiving = record["Receiving Courses"]
-                sending = record["Sending Courses"]
-
-                row_dict = {
-                    "UC Campus": uc_name,
-                    "CC": cc_name,
-                    "UC Course Requirement": "; ".join(receiving),
-                    "OR Groups": process_sending_courses(sending)
-                }
-
-                all_rows.append(row_dict)
-
-        if all_rows:
-            write_csv(cc_name, all_rows)
         else:
-            print(f"⚠️ No data extracted for {cc_name}.")
+            # a fresh run: parts from earlier runs must not end up in the CSV
+            store.clear_cc(cc_name)
+        cc_jobs[cc_name] = uc_urls
+
+    total = sum(len(v) for v in cc_jobs.values())
+    print(f"\n📘 Scheduling {total} UC jobs across {len(cc_jobs)} CCs with {workers} workers")
+
+    def on_job_done(cc_name, uc_name, records):
+        if records:
+            store.save_pair(cc_name, uc_name, records)
+
+    def on_cc_done(cc_name, _):
+        # with --resume, parts on disk include UCs finished by an earlier run
+        finish_cc(cc_name, store.load_cc(cc_name, cc_ucs[cc_name]))
+
+    # one browser per worker
+    scraping.get_pool(size=workers)
+    scheduler = ScrapeScheduler(
+        fetch=scrape_uc_data,
+        on_cc_done=on_cc_done,
+        on_job_done=on_job_done,
+        workers=workers,
+        limiter=RateLimiter(host_interval=host_interval, max_per_minute=max_per_minute),
+    )
+    scheduler.run(cc_jobs)
 
 def main():
-    process_all_ccs()
+    parser = argparse.ArgumentParser(description="Scrape every CC's UC articulation agreements.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="number of (CC, UC) pages fetched at the same time")
+    parser.add_argument("--host-interval", type=float, default=DEFAULT_HOST_INTERVAL,
+                        help="minimum seconds between requests to the same host")
+    parser.add_argument("--max-per-minute", type=int, default=DEFAULT_MAX_PER_MINUTE,
+                        help="global cap on requests per minute (0 = no cap)")
+    parser.add_argument("--cache-mode", choices=CACHE_MODES, default="default",
+                        help="refresh: ignore cached pages, offline: never touch the network, "
+                             "revalidate: refetch and report what changed")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL / 86400,
+                        help="days a cached agreement stays fresh")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip (CC, UC) pairs already saved by an earlier run")
+    args = parser.parse_args()
+    scraping.get_cache(mode=args.cache_mode, ttl=args.cache_ttl * 86400)
+
+    try:
+        process_all_ccs(workers=args.workers, host_interval=args.host_interval,
+                        max_per_minute=args.max_per_minute, resume=args.resume)
+    finally:
+        scraping.close_pool()
+        scraping.log_page_metrics()
+        scraping.get_cache().log_stats()
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,25 @@
 import os
-import sys
+import json
 import time
+import argparse
 import traceback
 import csv
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
 import logging
 
+# lxml parser is optional, fall back to BeautifulSoup's html.parser without it
+try:
+    import fast_parser
+except ImportError:
+    fast_parser = None
+
+from driver_pool import DriverPool, DEFAULT_POOL_SIZE, DEFAULT_MAX_PAGES
+from agreement_api import view_by_key, fetch_agreement_json, parse_agreement_json
+from assist_client import get_client
+from result_store import ResultStore, atomic_open
+from response_cache import ResponseCache, CacheMiss, CACHE_MODES, DEFAULT_TTL
+
 # where your per‐CC URL lists live:
 CC_AGREEMENTS_DIR = "cc_agreements"
 
@@ -23,41 +33,117 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# shared pool of headless browsers, created on first use
+_pool = None
+
+def get_pool(size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES):
+    global _pool
+    if _pool is None:
+        _pool = DriverPool(size=size, max_pages=max_pages)
+    return _pool
+
+def close_pool():
+    global _pool
+    if _pool is not None:
+        logging.info(f"Closing driver pool ({_pool.drivers_started} browsers started)")
+        _pool.close()
+        _pool = None
+
+# on-disk response cache, created on first use
+_cache = None
+
+def get_cache(mode="default", ttl=DEFAULT_TTL):
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(mode=mode, ttl=ttl)
+    return _cache
+
+# how long to wait for an agreement page to render
+PAGE_WAIT_SECONDS = 15
+
+# resolves as soon as articulation rows (or the "no agreements" marker) are
+# in the DOM, using a MutationObserver instead of re-reading page_source
+WAIT_FOR_AGREEMENT_JS = """
+const done = arguments[arguments.length - 1];
+function state() {
+    if (document.querySelector('.articRow')) return 'rows';
+    if (document.body && document.body.textContent.includes('No agreements were found')) return 'empty';
+    return null;
+}
+const now = state();
+if (now) { done(now); return; }
+const observer = new MutationObserver(() => {
+    const s = state();
+    if (s) { observer.disconnect(); done(s); }
+});
+observer.observe(document, {childList: true, subtree: true});
+"""
+
+# outerHTML of the smallest element holding every articulation row
+AGREEMENT_CONTAINER_JS = """
+const rows = document.querySelectorAll('.articRow');
+if (!rows.length) return null;
+const last = rows[rows.length - 1];
+let node = rows[0].parentElement;
+while (node && !node.contains(last)) node = node.parentElement;
+return node ? node.outerHTML : null;
+"""
+
+# per-page time-to-ready, appended by get_dynamic_html
+PAGE_METRICS = []
+
 def get_dynamic_html(url):
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--log-level=3")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    try:
-        driver.get(url)
-        # Wait up to 15 seconds for articulation rows to appear
-        wait_time = 15
+    with get_pool().driver() as driver:
         start_time = time.time()
-        while time.time() - start_time < wait_time:
-            html = driver.page_source
-            if "articRow" in html:
+        driver.get(url)
+        driver.set_script_timeout(PAGE_WAIT_SECONDS)
+        try:
+            state = driver.execute_async_script(WAIT_FOR_AGREEMENT_JS)
+        except TimeoutException:
+            state = "timeout"
+        ready = time.time() - start_time
+        PAGE_METRICS.append({"url": url, "state": state, "seconds": ready})
+        logging.info(f"Page ready in {ready:.2f}s ({state}): {url}")
+
+        if state == "rows":
+            html = driver.execute_script(AGREEMENT_CONTAINER_JS)
+            if html:
                 return html
-            time.sleep(1)
-        return html
-    finally:
-        driver.quit()
+        elif state == "empty":
+            return "<p>No agreements were found</p>"
+        # timed out (or the container lookup failed): hand back everything
+        # so parse_articulations can log what the page looked like
+        return driver.page_source
+
+def log_page_metrics():
+    if not PAGE_METRICS:
+        return
+    times = sorted(m["seconds"] for m in PAGE_METRICS)
+    timeouts = sum(1 for m in PAGE_METRICS if m["state"] == "timeout")
+    msg = (f"{len(times)} pages, time-to-ready avg {sum(times) / len(times):.2f}s, "
+           f"median {times[len(times) // 2]:.2f}s, max {times[-1]:.2f}s, {timeouts} timeouts")
+    logging.info(msg)
+    print(f"⏱️  {msg}")
 
 def parse_articulations(html):
-    soup = BeautifulSoup(html, "html.parser")
-    rows = soup.find_all("div", class_="articRow")
-    
+    if fast_parser:
+        out = fast_parser.parse_articulations(html)
+    else:
+        out = parse_articulations_bs4(html)
+
     # Add validation for empty results
-    if not rows:
+    if not out:
         logging.warning(f"No articulation rows found in HTML. Page length: {len(html)}")
         if "No agreements were found" in html:
             logging.warning("Page indicates no agreements exist")
         elif "loading" in html.lower():
             logging.warning("Page might not have finished loading")
-    
+    return out
+
+def parse_articulations_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
     out = []
-    for row in rows:
+    for row in soup.find_all("div", class_="articRow"):
         recv = extract_receiving_courses(row.select_one(".rowReceiving"))
         send = extract_sending_courses(row.select_one(".rowSending"))
         out.append({"Receiving": recv, "Sending": send})
@@ -106,14 +192,49 @@ def extract_sending_courses(row):
     # flatten if single OR‑group
     return groups[0] if len(groups)==1 else groups
 
-def parse_articulations(html):
-    soup = BeautifulSoup(html, "html.parser")
-    out = []
-    for row in soup.find_all("div", class_="articRow"):
-        recv = extract_receiving_courses(row.select_one(".rowReceiving"))
-        send = extract_sending_courses(row.select_one(".rowSending"))
-        out.append({"Receiving": recv, "Sending": send})
-    return out
+def fetch_articulations(url, limiter=None):
+    """
+    Articulation records for one agreement URL. Uses the JSON agreement
+    endpoint and only falls back to rendering the page in Chrome when that
+    fails or comes back empty. Both raw responses go through the response
+    cache, so re-parsing never needs the network. `limiter.wait(url)` is
+    only called before real network requests.
+    """
+    cache = get_cache()
+
+    def polite(fetch):
+        def wrapped():
+            if limiter:
+                limiter.wait(url)
+            return fetch()
+        return wrapped
+
+    key = view_by_key(url)
+    try:
+        if not key:
+            raise ValueError(f"No viewByKey in {url}")
+        raw = cache.get_or_fetch(
+            f"json:{key}",
+            polite(lambda: json.dumps(fetch_agreement_json(key)).encode("utf-8")),
+        )
+        arts = parse_agreement_json(json.loads(raw))
+        if arts:
+            return arts
+        logging.warning(f"JSON endpoint returned no articulations for {url}, falling back to browser")
+    except Exception as e:
+        logging.warning(f"JSON fetch failed for {url} ({e}), falling back to browser")
+
+    def fetch_page():
+        html = get_dynamic_html(url)
+        # only a rendered agreement (rows or the "no agreements" marker) is
+        # cached; a half-loaded page raises so the caller's retry refetches it
+        if "articRow" not in html and "No agreements were found" not in html:
+            parse_articulations(html)  # logs what the page looked like
+            raise TimeoutException(f"Agreement page did not finish loading: {url}")
+        return html.encode("utf-8")
+
+    html = cache.get_or_fetch(f"html:{url}", polite(fetch_page))
+    return parse_articulations(html.decode("utf-8"))
 
 def process_sending_courses(sending):
     if not sending or sending == ["Not Articulated"]:
@@ -153,7 +274,7 @@ def write_csv(cc_name, rows):
     max_groups = max(len(r["OR Groups"]) for r in rows) if rows else 0
     headers = ["UC Campus","CC","UC Course Requirement"] + [f"Courses Group {i}" for i in range(1, max_groups+1)]
 
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
+    with atomic_open(out_path, newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=headers)
         writer.writeheader()
         for rec in rows:
@@ -172,11 +293,20 @@ def write_csv(cc_name, rows):
     print(f"\n✅ Overwritten → {out_path}")
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scraping.py '<Community College Name>'")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Re-scrape all UC agreements for one community college.")
+    parser.add_argument("cc_name", help="e.g. 'De Anza College'")
+    parser.add_argument("--cache-mode", choices=CACHE_MODES, default="default",
+                        help="refresh: ignore cached pages, offline: never touch the network, "
+                             "revalidate: refetch and report what changed")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL / 86400,
+                        help="days a cached agreement stays fresh")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse UCs already saved by an earlier (crashed) run")
+    args = parser.parse_args()
+    get_cache(mode=args.cache_mode, ttl=args.cache_ttl * 86400)
+    store = ResultStore(RESULTS_DIR)
 
-    cc_name = sys.argv[1].strip()
+    cc_name = args.cc_name.strip()
     print(f"\n🔧 Re‐scraping all UCs for: {cc_name}\n")
     logging.info(f"Starting scraping for {cc_name}")
 
@@ -184,30 +314,37 @@ def main():
     if not pairs:
         logging.error(f"No URL pairs found for {cc_name}")
         return
+    if not args.resume:
+        # a fresh run: parts from earlier runs must not end up in the CSV
+        store.clear_cc(cc_name)
 
-    all_rows = []
     failed_ucs = []
-    
+
     for uc_name, url in pairs:
+        if args.resume and store.is_done(cc_name, uc_name):
+            print(f"→ {uc_name}: already on disk, skipping")
+            continue
         print(f"→ {uc_name}: {url}")
         logging.info(f"Processing {uc_name}: {url}")
-        
+
         for attempt in range(1, 4):  # Increased to 3 attempts
             try:
-                html = get_dynamic_html(url)
-                arts = parse_articulations(html)
+                arts = fetch_articulations(url)
                 if not arts:
                     logging.warning(f"No articulations found for {uc_name}")
-                
-                for a in arts:
-                    all_rows.append({
-                        "UC Campus": uc_name,
-                        "Receiving": a["Receiving"],
-                        "OR Groups": process_sending_courses(a["Sending"])
-                    })
+
+                else:
+                    # on disk right away, so a later crash does not lose this UC
+                    store.save_pair(cc_name, uc_name, arts)
                 logging.info(f"Successfully processed {uc_name} with {len(arts)} articulations")
                 break
-                
+
+            except CacheMiss:
+                # offline mode and nothing cached, retrying will not help
+                logging.error(f"No cached response for {uc_name} in offline mode")
+                print("  ✗ not in cache (offline mode)")
+                failed_ucs.append(uc_name)
+                break
             except Exception as e:
                 logging.error(f"Attempt {attempt} failed for {uc_name}: {str(e)}")
                 print(f"  ⚠️ attempt {attempt} failed: {e}")
@@ -224,6 +361,19 @@ def main():
             print(f"  - {uc}")
         logging.error(f"Failed UCs for {cc_name}: {', '.join(failed_ucs)}")
 
+    close_pool()
+    log_page_metrics()
+    get_cache().log_stats()
+    logging.info(f"assist.org API: {get_client().summary()}")
+
+    all_rows = []
+    for uc_name, arts in store.load_cc(cc_name, [uc for uc, _ in pairs]):
+        for a in arts:
+            all_rows.append({
+                "UC Campus": uc_name,
+                "Receiving": a["Receiving"],
+                "OR Groups": process_sending_courses(a["Sending"])
+            })
     write_csv(cc_name, all_rows)
     logging.info(f"Completed processing {cc_name}. Total rows: {len(all_rows)}")
 
@@ -0,0 +1,63 @@
+"""optimal_order against a brute-force search over every order of k UCs."""
+
+import os
+import random
+import sys
+from itertools import permutations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from articulation.bitset import UCBitsets
+
+
+class StubModel:
+    """model.uc(name) for UCBitsets; each "UC" is its own (courses, unarticulated)."""
+
+    def __init__(self, selections):
+        self.selections = selections
+
+    def uc(self, name):
+        return self.selections[name]
+
+
+def bitsets(selections):
+    return UCBitsets(StubModel(selections), list(selections), select=lambda selection: selection)
+
+
+def score(selections, order):
+    """(final cost, sum of running totals) of adding the UCs in `order`."""
+    taken, unarticulated, running = set(), 0, 0
+    for uc in order:
+        courses, missing = selections[uc]
+        taken |= set(courses)
+        unarticulated += len(missing)
+        running += len(taken) + unarticulated
+    return len(taken) + unarticulated, running
+
+
+def brute_force(selections, k):
+    """Lowest score() over every order of k UCs: cheapest set first, then running totals."""
+    return min(score(selections, order) for order in permutations(selections, k))
+
+
+def test_shared_courses_beat_a_cheap_first_step():
+    shared = [f"MATH {n}" for n in range(10)]
+    selections = {"A": (shared, []), "B": (shared, []), "C": (["CS 1"], [])}
+    order, added = bitsets(selections).optimal_order(2)
+    assert sorted(order) == ["A", "B"]
+    assert sum(art + unart for art, unart in added) == 10
+
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    pool = [f"C{n}" for n in range(12)]
+    for _ in range(200):
+        selections = {
+            f"UC{i}": (rng.sample(pool, rng.randint(0, 6)), ["x"] * rng.randint(0, 2))
+            for i in range(rng.randint(1, 5))
+        }
+        for k in range(1, len(selections) + 1):
+            order, added = bitsets(selections).optimal_order(k)
+            assert len(order) == len(set(order)) == k
+            final, running = brute_force(selections, k)
+            assert sum(art + unart for art, unart in added) == final
+            assert score(selections, order) == (final, running)